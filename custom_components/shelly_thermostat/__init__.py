@@ -9,41 +9,120 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-from .coordinator import ShellyDataUpdateCoordinator
+from .coordinator import ShellyDataUpdateCoordinator, models_store
 from .data import ShellyThermostatData
-from homeassistant.core import HomeAssistant
-from homeassistant.const import CONF_HOST
+from homeassistant.const import CONF_HOST, EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import callback
+from homeassistant.exceptions import ConfigEntryError, ConfigEntryNotReady
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers import config_validation as cv
 from homeassistant.loader import async_get_loaded_integration
 
-from .api import ShellyApiClient
-
-from .const import PLATFORMS
+from .api import (
+    ShellyApiClient,
+    ShellyThermostatApiClientError,
+    ShellyThermostatMqttDisabledError,
+)
+
+from .const import (
+    CONF_GEN,
+    CONF_MEDIAN_WINDOW,
+    CONF_OVERTEMP_OFFSET,
+    CONF_PAYLOAD_HISTORY,
+    CONF_TRANSPORT,
+    CONF_UNDERTEMP_OFFSET,
+    DEFAULT_MEDIAN_WINDOW,
+    DEFAULT_OVERTEMP_OFFSET,
+    DEFAULT_PAYLOAD_HISTORY,
+    DEFAULT_TRANSPORT,
+    DEFAULT_UNDERTEMP_OFFSET,
+    DOMAIN,
+    PLATFORMS,
+    TRANSPORT_MQTT,
+)
+from .schedule import ScheduleManager
+from .services import async_setup_services
 
 if TYPE_CHECKING:
     from homeassistant.core import HomeAssistant
+    from homeassistant.helpers.typing import ConfigType
 
     from .data import ShellyThermostatConfigEntry
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(
+    hass: HomeAssistant,
+    config: ConfigType,
+) -> bool:
+    """Set up the services and schedules of this integration."""
+    manager = hass.data[DOMAIN] = ScheduleManager(hass)
+    await manager.async_load()
+    # A callback, so the timers are cancelled in the event loop
+    hass.bus.async_listen_once(
+        EVENT_HOMEASSISTANT_STOP, callback(lambda _: manager.async_unload())
+    )
+    async_setup_services(hass)
+    return True
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ShellyThermostatConfigEntry,
 ) -> bool:
     """Set up this integration using UI."""
-    coordinator = ShellyDataUpdateCoordinator(hass)
-    entry.runtime_data = ShellyThermostatData(
-        client=ShellyApiClient(
-            entry.data[CONF_HOST],
-            session=async_get_clientsession(hass),
+    kwargs = {
+        "session": async_get_clientsession(hass),
+        "overtemp_offset": entry.options.get(
+            CONF_OVERTEMP_OFFSET, DEFAULT_OVERTEMP_OFFSET
+        ),
+        "undertemp_offset": entry.options.get(
+            CONF_UNDERTEMP_OFFSET, DEFAULT_UNDERTEMP_OFFSET
+        ),
+        "payload_history": entry.options.get(
+            CONF_PAYLOAD_HISTORY, DEFAULT_PAYLOAD_HISTORY
         ),
+    }
+    # Entries created before the generation was detected are Gen1 devices.
+    # The Gen2 and MQTT clients are only imported for the entries using them.
+    if entry.data.get(CONF_GEN, 1) >= 2:
+        from .rpc import ShellyRpcApiClient
+
+        client = ShellyRpcApiClient(hass, entry.data[CONF_HOST], **kwargs)
+    elif entry.options.get(CONF_TRANSPORT, DEFAULT_TRANSPORT) == TRANSPORT_MQTT:
+        from .mqtt_api import ShellyMqttApiClient
+
+        client = ShellyMqttApiClient(hass, entry.data[CONF_HOST], **kwargs)
+    else:
+        client = ShellyApiClient(entry.data[CONF_HOST], **kwargs)
+    coordinator = ShellyDataUpdateCoordinator(
+        hass,
+        median_window=entry.options.get(CONF_MEDIAN_WINDOW, DEFAULT_MEDIAN_WINDOW),
+    )
+    entry.runtime_data = ShellyThermostatData(
+        client=client,
         integration=async_get_loaded_integration(hass, entry.domain),
         coordinator=coordinator,
     )
 
+    await coordinator.async_load_models()
+    entry.async_on_unload(coordinator.async_save_models)
+
     # https://developers.home-assistant.io/docs/integration_fetching_data#coordinated-single-api-poll-for-data-for-all-entities
     await coordinator.async_config_entry_first_refresh()
 
+    try:
+        await client.async_start(
+            entry, coordinator.async_handle_push, coordinator.async_set_push_connected
+        )
+    except ShellyThermostatMqttDisabledError as exception:
+        # Retrying does not help until MQTT is enabled or the transport changed
+        raise ConfigEntryError(str(exception)) from exception
+    except ShellyThermostatApiClientError as exception:
+        raise ConfigEntryNotReady(str(exception)) from exception
+    entry.async_on_unload(client.async_stop)
+
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     entry.async_on_unload(entry.add_update_listener(async_reload_entry))
 
@@ -58,10 +137,21 @@ async def async_unload_entry(
     return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
 
+async def async_remove_entry(
+    hass: HomeAssistant,
+    entry: ShellyThermostatConfigEntry,
+) -> None:
+    """Handle removal of an entry."""
+    if DOMAIN in hass.data:
+        hass.data[DOMAIN].async_clear_schedule([entry.entry_id])
+    await models_store(hass, entry.entry_id).async_remove()
+
+
 async def async_reload_entry(
     hass: HomeAssistant,
     entry: ShellyThermostatConfigEntry,
 ) -> None:
     """Reload config entry."""
-    await async_unload_entry(hass, entry)
-    await async_setup_entry(hass, entry)
+    # Reload through the config entries, so the async_on_unload callbacks
+    # run and the client connection is closed before the new setup.
+    await hass.config_entries.async_reload(entry.entry_id)
@@ -3,10 +3,20 @@
 import logging
 import asyncio
 import socket
+from abc import ABC, abstractmethod
+from collections import deque
+from collections.abc import Callable
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING
 import aiohttp
-import async_timeout
+
+from .const import DEFAULT_OVERTEMP_OFFSET, DEFAULT_UNDERTEMP_OFFSET
+
+if TYPE_CHECKING:
+    from homeassistant.config_entries import ConfigEntry
 
 TIMEOUT = 10
+THRESHOLD_PRECISION = 2
 RELAY_ON = "relay_on"
 RELAY_OFF = "relay_off"
 DISABLED = "disabled"
@@ -15,6 +25,13 @@ HVAC_MODE_HEAT = "heat"
 HVAC_MODE_COOL = "cool"
 HVAC_MODE_OFF = "off"
 
+# (overtemp_act, undertemp_act) for each hvac mode
+HVAC_MODE_ACTIONS = {
+    HVAC_MODE_HEAT: (RELAY_OFF, RELAY_ON),
+    HVAC_MODE_COOL: (RELAY_ON, RELAY_OFF),
+    HVAC_MODE_OFF: (DISABLED, DISABLED),
+}
+
 _LOGGER: logging.Logger = logging.getLogger(__package__)
 
 
@@ -22,47 +39,198 @@ class ShellyThermostatApiClientError(Exception):
     """Exception to indicate a general API error."""
 
 
-class ShellyApiClient:
-    def __init__(self, host: str, session: aiohttp.ClientSession) -> None:
-        """Sample API Client."""
+class ShellyThermostatMqttDisabledError(ShellyThermostatApiClientError):
+    """Exception to indicate that MQTT is not enabled on the device."""
+
+
+def hvac_mode_from_actions(overtemp_action: str, undertemp_action: str) -> str:
+    """Return the hvac mode for the threshold actions."""
+    for mode, actions in HVAC_MODE_ACTIONS.items():
+        if actions == (overtemp_action, undertemp_action):
+            return mode
+    _LOGGER.error("Invalid thermostat configuration")
+    return "unknown"
+
+
+async def async_get_generation(host: str, session: aiohttp.ClientSession) -> int:
+    """Return the API generation of the device."""
+    try:
+        async with asyncio.timeout(TIMEOUT):
+            response = await session.get(f"http://{host}/shelly")
+            info = await response.json(content_type=None)
+    except (TimeoutError, aiohttp.ClientError, socket.gaierror) as exception:
+        raise ShellyThermostatApiClientError(
+            f"Error fetching the device info of {host} - {exception}"
+        ) from exception
+    # Gen1 devices do not report a generation
+    return int(info.get("gen", 1))
+
+
+class ShellyBaseApiClient(ABC):
+    """Base class of the API clients for the different device generations."""
+
+    def __init__(
+        self,
+        host: str,
+        session: aiohttp.ClientSession,
+        overtemp_offset: float = DEFAULT_OVERTEMP_OFFSET,
+        undertemp_offset: float = DEFAULT_UNDERTEMP_OFFSET,
+        payload_history: int = 0,
+    ) -> None:
+        """Initialize the API client.
+
+        With a `payload_history` the last raw responses of the device are kept
+        for the diagnostics, otherwise they are only fetched when requested.
+        """
         self._host = host
         self._session = session
+        self._overtemp_offset = overtemp_offset
+        self._undertemp_offset = undertemp_offset
+        self.payloads: deque[dict] | None = (
+            deque(maxlen=payload_history) if payload_history > 0 else None
+        )
+
+    def _capture(self, name: str, payload: dict) -> None:
+        """Keep a raw response if the payload history is enabled."""
+        if self.payloads is not None:
+            self.payloads.append(
+                {
+                    "time": datetime.now(UTC).isoformat(),
+                    "name": name,
+                    "payload": payload,
+                }
+            )
+
+    def thresholds_for(self, target_temperature: float) -> tuple[float, float]:
+        """Return the (overtemp, undertemp) thresholds for a target temperature."""
+        return (
+            round(target_temperature + self._overtemp_offset, THRESHOLD_PRECISION),
+            round(target_temperature - self._undertemp_offset, THRESHOLD_PRECISION),
+        )
+
+    def target_from_thresholds(
+        self, overtemp_threshold: float, undertemp_threshold: float
+    ) -> float:
+        """Return the target temperature for the configured thresholds.
+
+        This is the exact inverse of `thresholds_for`, so a target written by
+        this integration is read back unchanged even for asymmetric offsets.
+        """
+        return round(
+            (
+                (overtemp_threshold - self._overtemp_offset)
+                + (undertemp_threshold + self._undertemp_offset)
+            )
+            / 2,
+            THRESHOLD_PRECISION,
+        )
+
+    async def async_start(
+        self,
+        entry: "ConfigEntry",
+        on_update: Callable[[dict], None],
+        on_connection: Callable[[bool], None],
+    ) -> None:
+        """Start receiving updates.
+
+        `on_update` is called with the changed data pushed by the device and
+        `on_connection` when the push connection is established or lost.
+        Clients which only poll never call them.
+        """
+
+    async def async_stop(self) -> None:
+        """Stop receiving updates."""
+
+    @abstractmethod
+    async def async_get_data(self) -> dict:
+        """Return the current data of the device."""
+
+    @abstractmethod
+    async def async_get_raw_data(self) -> dict:
+        """Return the raw responses of the device, for the diagnostics."""
+
+    async def async_set_target_temperature(self, target_temperature: float) -> None:
+        """Set the thresholds around the target temperature."""
+        await self.async_set_thresholds(*self.thresholds_for(target_temperature))
+
+    @abstractmethod
+    async def async_set_thresholds(
+        self, overtemp_threshold: float, undertemp_threshold: float
+    ) -> None:
+        """Set the overtemp and undertemp thresholds."""
+
+    @abstractmethod
+    async def async_set_hvac_mode(self, mode: str) -> None:
+        """Set the threshold actions for the hvac mode."""
+
+
+class ShellyApiClient(ShellyBaseApiClient):
+    """API client for Gen1 devices using the REST endpoints."""
 
     async def async_get_data(self) -> dict:
+        return {
+            **await self.async_get_status_data(),
+            **await self.async_get_settings_data(),
+        }
+
+    async def async_get_raw_data(self) -> dict:
+        """Return the raw /status and /settings responses."""
+        return {
+            "status": await self.api_wrapper("get", f"http://{self._host}/status"),
+            "settings": await self.api_wrapper("get", f"http://{self._host}/settings"),
+        }
+
+    async def async_get_status_data(self) -> dict:
+        """Return the data of the /status endpoint."""
         result = {}
         status = await self.api_wrapper(
             "get",
             f"http://{self._host}/status",
         )
-        result["status"] = status
-        result["temperature"] = float(status.get("ext_temperature").get("0").get("tC"))
+        if status is None:
+            raise ShellyThermostatApiClientError(
+                f"Failed to read the status of {self._host}"
+            )
+        self._capture("status", status)
+        # The reading is missing while the sensor is disconnected
+        sensor = (status.get("ext_temperature") or {}).get("0") or {}
+        result["temperature"] = (
+            float(sensor["tC"]) if sensor.get("tC") is not None else None
+        )
         result["output"] = status.get("relays")[0].get("ison")
         result["mac"] = status.get("mac")
+        result["uptime"] = status.get("uptime")
+        return result
 
+    async def async_get_settings_data(self) -> dict:
+        """Return the data of the /settings endpoint."""
+        result = {}
         settings = await self.api_wrapper(
             "get",
             f"http://{self._host}/settings",
         )
-        result["settings"] = settings
+        if settings is None:
+            raise ShellyThermostatApiClientError(
+                f"Failed to read the settings of {self._host}"
+            )
+        self._capture("settings", settings)
         temp_settings = settings.get("ext_temperature").get("0")
-        overtemp_action = temp_settings["overtemp_act"]
-        undertemp_action = temp_settings["undertemp_act"]
-        if overtemp_action == RELAY_OFF and undertemp_action == RELAY_ON:
-            result["hvac_mode"] = "heat"
-        elif overtemp_action == RELAY_ON and undertemp_action == RELAY_OFF:
-            result["hvac_mode"] = "cool"
-        elif overtemp_action == DISABLED and undertemp_action == DISABLED:
-            result["hvac_mode"] = "off"
-        else:
-            _LOGGER.error("Invalid thermostat configuration")
-            result["hvac_mode"] = "unknown"
+        result["hvac_mode"] = hvac_mode_from_actions(
+            temp_settings["overtemp_act"], temp_settings["undertemp_act"]
+        )
 
         overtemp_threshold = float(temp_settings["overtemp_threshold_tC"])
         undertemp_threshold = float(temp_settings["undertemp_threshold_tC"])
-        result["target_temperature"] = (overtemp_threshold + undertemp_threshold) / 2
+        result["overtemp_threshold"] = overtemp_threshold
+        result["undertemp_threshold"] = undertemp_threshold
+        result["target_temperature"] = self.target_from_thresholds(
+            overtemp_threshold, undertemp_threshold
+        )
 
         result["name"] = settings.get("name")
         result["model"] = settings.get("device").get("type")
+        mqtt = settings.get("mqtt", {})
+        result["mqtt_id"] = mqtt.get("id") if mqtt.get("enable") else None
 
         return result
 
@@ -93,46 +261,33 @@ class ShellyApiClient:
         ) / 2
     """
 
-    async def async_set_target_temperature(
-        self, target_temperature: float, hystersis: float = 0.4
-    ) -> float:
-        await self.api_wrapper(
-            "get",
-            f"http://{self._host}/settings/ext_temperature/0?overtemp_threshold_tC={target_temperature + hystersis / 2}",
-        )
-        await self.api_wrapper(
-            "get",
-            f"http://{self._host}/settings/ext_temperature/0?undertemp_threshold_tC={target_temperature - hystersis / 2}",
+    async def async_set_thresholds(
+        self, overtemp_threshold: float, undertemp_threshold: float
+    ) -> None:
+        """Set both thresholds with a single settings write."""
+        await self._async_write_temperature_settings(
+            f"overtemp_threshold_tC={overtemp_threshold}"
+            f"&undertemp_threshold_tC={undertemp_threshold}"
         )
 
     async def async_set_hvac_mode(self, mode: str) -> None:
-        """Get data from the API."""
-        if mode == HVAC_MODE_HEAT:
-            await self.api_wrapper(
-                "get",
-                f"http://{self._host}/settings/ext_temperature/0?overtemp_act={RELAY_OFF}",
-            )
-            await self.api_wrapper(
-                "get",
-                f"http://{self._host}/settings/ext_temperature/0?undertemp_act={RELAY_ON}",
-            )
-        elif mode == HVAC_MODE_COOL:
-            await self.api_wrapper(
-                "get",
-                f"http://{self._host}/settings/ext_temperature/0?overtemp_act={RELAY_ON}",
-            )
-            await self.api_wrapper(
-                "get",
-                f"http://{self._host}/settings/ext_temperature/0?undertemp_act={RELAY_OFF}",
-            )
-        elif mode == HVAC_MODE_OFF:
-            await self.api_wrapper(
-                "get",
-                f"http://{self._host}/settings/ext_temperature/0?overtemp_act={DISABLED}",
-            )
-            await self.api_wrapper(
-                "get",
-                f"http://{self._host}/settings/ext_temperature/0?undertemp_act={DISABLED}",
+        """Set both threshold actions for the mode with a single settings write."""
+        if mode not in HVAC_MODE_ACTIONS:
+            return
+        overtemp_action, undertemp_action = HVAC_MODE_ACTIONS[mode]
+        await self._async_write_temperature_settings(
+            f"overtemp_act={overtemp_action}&undertemp_act={undertemp_action}"
+        )
+
+    async def _async_write_temperature_settings(self, query: str) -> None:
+        """Write the external temperature settings given as a query string."""
+        response = await self.api_wrapper(
+            "get",
+            f"http://{self._host}/settings/ext_temperature/0?{query}",
+        )
+        if response is None:
+            raise ShellyThermostatApiClientError(
+                f"Failed to write the settings of {self._host}"
             )
 
     async def api_wrapper(
@@ -140,7 +295,7 @@ class ShellyApiClient:
     ) -> dict:
         """Get information from the API."""
         try:
-            async with async_timeout.timeout(TIMEOUT):
+            async with asyncio.timeout(TIMEOUT):
                 if method == "get":
                     response = await self._session.get(url, headers=headers)
                     return await response.json()
@@ -0,0 +1,99 @@
+"""Binary sensor platform for shelly_thermostat."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.binary_sensor import (
+    BinarySensorDeviceClass,
+    BinarySensorEntity,
+    BinarySensorEntityDescription,
+)
+from homeassistant.const import EntityCategory
+
+from .entity import ShellyThermostatEntity
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+    from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+    from .coordinator import ShellyDataUpdateCoordinator
+    from .data import ShellyThermostatConfigEntry
+
+
+@dataclass(frozen=True, kw_only=True)
+class ShellyThermostatBinarySensorEntityDescription(BinarySensorEntityDescription):
+    """Describes a Shelly Thermostat binary sensor."""
+
+    is_on_fn: Callable[[ShellyDataUpdateCoordinator], bool | None]
+    attributes_fn: Callable[[ShellyDataUpdateCoordinator], dict[str, Any]] | None = None
+
+
+ENTITY_DESCRIPTIONS = (
+    ShellyThermostatBinarySensorEntityDescription(
+        key="temperature_problem",
+        name="Temperature sensor problem",
+        has_entity_name=True,
+        device_class=BinarySensorDeviceClass.PROBLEM,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        is_on_fn=lambda coordinator: (
+            coordinator.data.get("temperature_fault") is not None
+        ),
+        attributes_fn=lambda coordinator: {
+            "fault": coordinator.data.get("temperature_fault"),
+            "raw_temperature": coordinator.data.get("raw_temperature"),
+        },
+    ),
+)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ShellyThermostatConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up the binary sensor platform."""
+    async_add_entities(
+        ShellyThermostatBinarySensor(
+            coordinator=entry.runtime_data.coordinator,
+            entry=entry,
+            entity_description=entity_description,
+        )
+        for entity_description in ENTITY_DESCRIPTIONS
+    )
+
+
+class ShellyThermostatBinarySensor(ShellyThermostatEntity, BinarySensorEntity):
+    """Shelly Thermostat binary sensor class."""
+
+    entity_description: ShellyThermostatBinarySensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: ShellyDataUpdateCoordinator,
+        entry: ShellyThermostatConfigEntry,
+        entity_description: ShellyThermostatBinarySensorEntityDescription,
+    ):
+        """Initialize the binary sensor."""
+        self.entity_description = entity_description
+
+        super().__init__(coordinator, entry)
+
+    @property
+    def unique_id(self):
+        """Return a unique ID to use for this entity."""
+        return f"{super().unique_id}_{self.entity_description.key}"
+
+    @property
+    def is_on(self):
+        """Return true if the binary sensor is on."""
+        return self.entity_description.is_on_fn(self.coordinator)
+
+    @property
+    def extra_state_attributes(self):
+        """Return the state attributes."""
+        if self.entity_description.attributes_fn is None:
+            return None
+        return self.entity_description.attributes_fn(self.coordinator)
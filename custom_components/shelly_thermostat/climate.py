@@ -15,6 +15,7 @@ from homeassistant.components.climate import (
 
 from homeassistant.components.climate.const import HVACMode, HVACAction
 
+from .const import MAX_TARGET_TEMPERATURE, MIN_TARGET_TEMPERATURE
 from .entity import ShellyThermostatEntity
 
 
@@ -59,8 +60,8 @@ class ShellyThermostatClimate(ShellyThermostatEntity, ClimateEntity):
         | ClimateEntityFeature.TURN_OFF
         | ClimateEntityFeature.TURN_ON
     )
-    _attr_max_temp = 35
-    _attr_min_temp = 5
+    _attr_max_temp = MAX_TARGET_TEMPERATURE
+    _attr_min_temp = MIN_TARGET_TEMPERATURE
     _attr_target_temperature_step = 0.1
     _attr_icon = "mdi:thermostat"
 
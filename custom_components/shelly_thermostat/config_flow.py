@@ -6,10 +6,32 @@ from homeassistant import config_entries
 from homeassistant.core import callback
 import voluptuous as vol
 from homeassistant.const import CONF_HOST
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
+from .api import (
+    ShellyApiClient,
+    ShellyThermostatApiClientError,
+    async_get_generation,
+)
 from .const import (
+    CONF_GEN,
+    CONF_MEDIAN_WINDOW,
+    CONF_OVERTEMP_OFFSET,
+    CONF_PAYLOAD_HISTORY,
+    CONF_TRANSPORT,
+    CONF_UNDERTEMP_OFFSET,
     DEFAULT_HOST_NAME,
+    DEFAULT_MEDIAN_WINDOW,
+    DEFAULT_OVERTEMP_OFFSET,
+    DEFAULT_PAYLOAD_HISTORY,
+    DEFAULT_TRANSPORT,
+    DEFAULT_UNDERTEMP_OFFSET,
     DOMAIN,
+    MAX_MEDIAN_WINDOW,
+    MAX_PAYLOAD_HISTORY,
+    MAX_THRESHOLD_OFFSET,
+    TRANSPORT_HTTP,
+    TRANSPORT_MQTT,
 )
 from homeassistant.core import HomeAssistant
 
@@ -19,6 +41,8 @@ DATA_SCHEMA = vol.Schema(
     }
 )
 
+OFFSET_SCHEMA = vol.All(vol.Coerce(float), vol.Range(min=0, max=MAX_THRESHOLD_OFFSET))
+
 
 def host_valid(host):
     """Return True if hostname or IP address is valid."""
@@ -48,6 +72,12 @@ class ShellyThermostatFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
         """Initialize."""
         self._errors = {}
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry):
+        """Get the options flow for this handler."""
+        return ShellyThermostatOptionsFlowHandler(config_entry)
+
     def _host_in_configuration_exists(self, host) -> bool:
         """Return True if host exists in configuration."""
         if host in shelly_thermostat_entries(self.hass):
@@ -71,9 +101,17 @@ class ShellyThermostatFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
             else:
                 await self.async_set_unique_id(user_input[CONF_HOST])
                 self._abort_if_unique_id_configured()
-                return self.async_create_entry(
-                    title=user_input[CONF_HOST], data=user_input
-                )
+                try:
+                    generation = await async_get_generation(
+                        host, async_get_clientsession(self.hass)
+                    )
+                except ShellyThermostatApiClientError:
+                    self._errors["base"] = "cannot_connect"
+                else:
+                    return self.async_create_entry(
+                        title=user_input[CONF_HOST],
+                        data={**user_input, CONF_GEN: generation},
+                    )
             return await self._show_config_form(user_input)
 
         user_input = {}
@@ -92,3 +130,91 @@ class ShellyThermostatFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
             ),
             errors=self._errors,
         )
+
+
+class ShellyThermostatOptionsFlowHandler(config_entries.OptionsFlow):
+    """Options flow for the threshold offsets of a Shelly Thermostat."""
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        """Initialize.
+
+        The entry is kept here, as `OptionsFlow.config_entry` is only set by
+        Home Assistant 2024.11 and later.
+        """
+        self.entry = config_entry
+
+    async def async_step_init(self, user_input=None):
+        """Manage the threshold offsets and the transport.
+
+        The MQTT transport is only accepted if MQTT is enabled on the device.
+        """
+        errors = {}
+        if user_input is not None:
+            if (
+                user_input[CONF_OVERTEMP_OFFSET] + user_input[CONF_UNDERTEMP_OFFSET]
+                <= 0
+            ):
+                errors["base"] = "invalid_hysteresis"
+            elif user_input.get(CONF_TRANSPORT) == TRANSPORT_MQTT:
+                errors = await self._async_validate_mqtt()
+            if not errors:
+                return self.async_create_entry(title="", data=user_input)
+
+        options = self.entry.options
+        schema = {}
+        # Gen2 devices always push their status over their WebSocket
+        if self.entry.data.get(CONF_GEN, 1) < 2:
+            schema[
+                vol.Required(
+                    CONF_TRANSPORT,
+                    default=options.get(CONF_TRANSPORT, DEFAULT_TRANSPORT),
+                )
+            ] = vol.In([TRANSPORT_HTTP, TRANSPORT_MQTT])
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    **schema,
+                    vol.Required(
+                        CONF_OVERTEMP_OFFSET,
+                        default=options.get(
+                            CONF_OVERTEMP_OFFSET, DEFAULT_OVERTEMP_OFFSET
+                        ),
+                    ): OFFSET_SCHEMA,
+                    vol.Required(
+                        CONF_UNDERTEMP_OFFSET,
+                        default=options.get(
+                            CONF_UNDERTEMP_OFFSET, DEFAULT_UNDERTEMP_OFFSET
+                        ),
+                    ): OFFSET_SCHEMA,
+                    vol.Required(
+                        CONF_MEDIAN_WINDOW,
+                        default=options.get(CONF_MEDIAN_WINDOW, DEFAULT_MEDIAN_WINDOW),
+                    ): vol.All(
+                        vol.Coerce(int), vol.Range(min=1, max=MAX_MEDIAN_WINDOW)
+                    ),
+                    vol.Required(
+                        CONF_PAYLOAD_HISTORY,
+                        default=options.get(
+                            CONF_PAYLOAD_HISTORY, DEFAULT_PAYLOAD_HISTORY
+                        ),
+                    ): vol.All(
+                        vol.Coerce(int), vol.Range(min=0, max=MAX_PAYLOAD_HISTORY)
+                    ),
+                }
+            ),
+            errors=errors,
+        )
+
+    async def _async_validate_mqtt(self) -> dict[str, str]:
+        """Return the errors if the status can not be received over MQTT."""
+        client = ShellyApiClient(
+            self.entry.data[CONF_HOST], async_get_clientsession(self.hass)
+        )
+        try:
+            settings = await client.async_get_settings_data()
+        except ShellyThermostatApiClientError:
+            return {"base": "cannot_connect"}
+        if settings["mqtt_id"] is None:
+            return {CONF_TRANSPORT: "mqtt_disabled"}
+        return {}
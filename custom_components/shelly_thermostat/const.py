@@ -15,10 +15,52 @@ ISSUE_URL = "https://github.com/pail23/shelly-thermostat-component/issues"
 DEFAULT_SCAN_INTERVAL = 30
 DEFAULT_HOST_NAME = ""
 
+# Config
+CONF_GEN = "gen"
+
+# Options
+CONF_OVERTEMP_OFFSET = "overtemp_offset"
+CONF_UNDERTEMP_OFFSET = "undertemp_offset"
+DEFAULT_OVERTEMP_OFFSET = 0.2
+DEFAULT_UNDERTEMP_OFFSET = 0.2
+MAX_THRESHOLD_OFFSET = 5.0
+CONF_TRANSPORT = "transport"
+TRANSPORT_HTTP = "http"
+TRANSPORT_MQTT = "mqtt"
+DEFAULT_TRANSPORT = TRANSPORT_HTTP
+# Number of raw device responses kept for the diagnostics, 0 fetches on demand
+CONF_PAYLOAD_HISTORY = "payload_history"
+DEFAULT_PAYLOAD_HISTORY = 0
+MAX_PAYLOAD_HISTORY = 20
+# Number of temperature readings of the median filter, 1 disables it
+CONF_MEDIAN_WINDOW = "median_window"
+DEFAULT_MEDIAN_WINDOW = 1
+MAX_MEDIAN_WINDOW = 9
+
+# Limits of the target temperature, also used by the services.yaml selectors
+MIN_TARGET_TEMPERATURE = 5
+MAX_TARGET_TEMPERATURE = 35
+
+# Services
+SERVICE_SET_ZONE = "set_zone"
+SERVICE_SET_SCHEDULE = "set_schedule"
+SERVICE_CLEAR_SCHEDULE = "clear_schedule"
+SERVICE_REACH_TARGET_BY = "reach_target_by"
+ATTR_DEADLINE = "deadline"
+ATTR_DAYS = "days"
+ATTR_SCHEDULE = "schedule"
+ATTR_FORCE = "force"
+# Same as the climate attribute, without importing the climate integration
+ATTR_HVAC_MODE = "hvac_mode"
+ATTR_MAX_CONCURRENCY = "max_concurrency"
+DEFAULT_ZONE_CONCURRENCY = 8
+
 
 # Platforms
+BINARY_SENSOR = "binary_sensor"
 CLIMATE = "climate"
-PLATFORMS = [CLIMATE]
+SENSOR = "sensor"
+PLATFORMS = [BINARY_SENSOR, CLIMATE, SENSOR]
 
 
 # Defaults
@@ -2,21 +2,50 @@
 
 from __future__ import annotations
 
+import math
+import time
+from collections.abc import Coroutine
 from datetime import timedelta
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from .api import ShellyThermostatApiClientError
+from homeassistant.core import callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
 from .const import DOMAIN, LOGGER
+from .stats import ThermostatStatistics
+from .thermal import ThermalModel
+from .validation import FAULT_STALE, TemperatureFilter
 
 if TYPE_CHECKING:
+    from datetime import datetime
+
     from homeassistant.core import HomeAssistant
 
     from .data import ShellyThermostatConfigEntry
 
 
 SCAN_INTERVAL = timedelta(seconds=30)
+# Devices pushing their status are only polled to catch up on settings changes
+PUSH_SCAN_INTERVAL = timedelta(minutes=5)
+THRESHOLD_TOLERANCE = 0.005
+
+MODELS_STORAGE_VERSION = 1
+MODELS_SAVE_DELAY = 300
+# Preheating starts this much earlier than estimated, to absorb the time
+# between two samples and the estimation error.
+PREHEAT_MARGIN = timedelta(minutes=10)
+# Used while there is no estimate yet or the target is not reached at the
+# estimated rate.
+FALLBACK_PREHEAT_WINDOW = timedelta(hours=2)
+
+
+def models_store(hass: HomeAssistant, entry_id: str) -> Store[dict]:
+    """Return the store of the learned models of a config entry."""
+    return Store(hass, MODELS_STORAGE_VERSION, f"{DOMAIN}.{entry_id}")
 
 
 class ShellyDataUpdateCoordinator(DataUpdateCoordinator):
@@ -24,25 +53,241 @@ class ShellyDataUpdateCoordinator(DataUpdateCoordinator):
 
     config_entry: ShellyThermostatConfigEntry
 
-    def __init__(self, hass: HomeAssistant) -> None:
+    def __init__(self, hass: HomeAssistant, median_window: int = 1) -> None:
         """Initialize."""
         self.platforms = []
+        self.writes_sent = 0
+        self.writes_avoided = 0
+        self.temperature_filter = TemperatureFilter(median_window)
+        self.thermal = ThermalModel()
+        self.statistics = ThermostatStatistics()
+        # (target temperature, deadline) of a pending `reach_target_by`
+        self.preheat: tuple[float, datetime] | None = None
+
+        super().__init__(
+            hass,
+            LOGGER,
+            name=DOMAIN,
+            update_interval=SCAN_INTERVAL,
+        )
+        self._store = models_store(hass, self.config_entry.entry_id)
+
+    async def async_load_models(self) -> None:
+        """Restore the learned models."""
+        if (data := await self._store.async_load()) is None:
+            return
+        try:
+            self.thermal = ThermalModel.from_dict(data["thermal"])
+        except (KeyError, TypeError, ValueError):
+            LOGGER.warning(
+                "Ignoring the corrupt thermal model of %s", self.config_entry.title
+            )
+        if "statistics" not in data:
+            return
+        try:
+            self.statistics = ThermostatStatistics.from_dict(data["statistics"])
+        except (KeyError, TypeError, ValueError):
+            LOGGER.warning(
+                "Ignoring the corrupt statistics of %s", self.config_entry.title
+            )
 
-        super().__init__(hass, LOGGER, name=DOMAIN, update_interval=SCAN_INTERVAL)
+    async def async_save_models(self) -> None:
+        """Save the learned models now, e.g. before the entry is unloaded."""
+        await self._store.async_save(self._models_to_save())
+
+    @callback
+    def _models_to_save(self) -> dict:
+        """Return the learned models to store."""
+        return {
+            "thermal": self.thermal.as_dict(),
+            "statistics": self.statistics.as_dict(),
+        }
 
     async def _async_update_data(self):
         """Update data via library."""
         try:
-            return await self.config_entry.runtime_data.client.async_get_data()
+            data = await self.config_entry.runtime_data.client.async_get_data()
         except ShellyThermostatApiClientError as exception:
             raise UpdateFailed(exception) from exception
+        # A pushed status is not polled again, so it is kept from the last data
+        return self._async_process_data({**(self.data or {}), **data}, data)
+
+    @callback
+    def _async_process_data(self, data: dict, received: dict) -> dict:
+        """Validate the received readings and feed them to the models.
+
+        `received` holds the fields just polled or pushed by the device and
+        `data` all the data, including the fields kept from earlier updates.
+        """
+        if "temperature" in received:
+            raw_temperature = received["temperature"]
+            data["raw_temperature"] = raw_temperature
+            data["temperature"], data["temperature_fault"] = (
+                self.temperature_filter.filter(
+                    time.monotonic(), raw_temperature, received.get("uptime")
+                )
+            )
+            if data["temperature_fault"] is not None:
+                LOGGER.debug(
+                    "Rejected the temperature %s of %s - %s",
+                    raw_temperature,
+                    self.config_entry.title,
+                    data["temperature_fault"],
+                )
+        elif data.get("temperature") is not None and self.temperature_filter.expired(
+            time.monotonic()
+        ):
+            # No reading was pushed or polled for a long time
+            data["temperature"], data["temperature_fault"] = None, FAULT_STALE
+        temperature = data.get("temperature")
+        output = bool(data.get("output"))
+        if temperature is not None:
+            self.thermal.add_sample(time.monotonic(), temperature, output)
+        self.statistics.add_sample(dt_util.utcnow().timestamp(), temperature, output)
+        self._store.async_delay_save(self._models_to_save, MODELS_SAVE_DELAY)
+        self._async_check_preheat(data)
+        return data
+
+    @callback
+    def async_handle_push(self, changes: dict) -> None:
+        """Merge the changes pushed by the device into the data."""
+        if self.data is None:
+            return
+        # Unlike async_set_updated_data this keeps the poll schedule, so the
+        # settings are still refreshed while the device pushes its status.
+        self.data = self._async_process_data({**self.data, **changes}, changes)
+        self.async_update_listeners()
+
+    @callback
+    def async_set_push_connected(self, connected: bool) -> None:
+        """Poll less often while the device pushes its status.
 
-    async def async_set_target_temperature(self, target_temperature: float) -> None:
-        await self.config_entry.runtime_data.client.async_set_target_temperature(
-            target_temperature
+        While the push connection is down the status is polled at the normal
+        interval again.
+        """
+        self.update_interval = PUSH_SCAN_INTERVAL if connected else SCAN_INTERVAL
+        if self._listeners:
+            # Reschedule the pending poll for the new interval
+            self._schedule_refresh()
+
+    def hours_to_target(
+        self, data: dict | None = None, target: float | None = None
+    ) -> float | None:
+        """Return the estimated hours to reach the target temperature."""
+        data = data if data is not None else self.data
+        if not data or (temperature := data.get("temperature")) is None:
+            return None
+        if target is None and (target := data.get("target_temperature")) is None:
+            return None
+        return self.thermal.hours_to_target(temperature, target, data.get("hvac_mode"))
+
+    @callback
+    def async_reach_target_by(self, target: float, deadline: datetime) -> None:
+        """Set the target temperature just in time to reach it by the deadline."""
+        self.preheat = (target, deadline)
+        if self.data:
+            self._async_check_preheat(self.data)
+
+    @callback
+    def _async_check_preheat(self, data: dict) -> None:
+        """Start a pending preheat once it is due."""
+        if self.preheat is None:
+            return
+        target, deadline = self.preheat
+        if (hours := self.hours_to_target(data, target)) is None:
+            start = deadline - FALLBACK_PREHEAT_WINDOW
+        else:
+            start = deadline - timedelta(hours=hours) - PREHEAT_MARGIN
+        if dt_util.utcnow() < start:
+            return
+        LOGGER.debug("Preheating to %s to reach it by %s", target, deadline)
+        self.preheat = None
+        self.config_entry.async_create_background_task(
+            self.hass,
+            self._async_preheat(target, deadline),
+            f"{DOMAIN} preheat {self.config_entry.entry_id}",
         )
-        await self.async_request_refresh()
 
-    async def async_set_hvac_mode(self, mode: str) -> None:
-        await self.config_entry.runtime_data.client.async_set_hvac_mode(mode)
-        await self.async_request_refresh()
+    async def _async_preheat(self, target: float, deadline: datetime) -> None:
+        """Set the target temperature of a preheat, retry on the next update."""
+        try:
+            await self.async_set_target_temperature(target)
+        except HomeAssistantError as exception:
+            LOGGER.warning("Could not start preheating - %s", exception)
+            if self.preheat is None:
+                self.preheat = (target, deadline)
+
+    def _thresholds_match(self, overtemp: float, undertemp: float) -> bool:
+        """Return True if the device already uses the given thresholds."""
+        if not self.data:
+            return False
+        current_overtemp = self.data.get("overtemp_threshold")
+        current_undertemp = self.data.get("undertemp_threshold")
+        if current_overtemp is None or current_undertemp is None:
+            return False
+        return math.isclose(
+            current_overtemp, overtemp, abs_tol=THRESHOLD_TOLERANCE
+        ) and math.isclose(current_undertemp, undertemp, abs_tol=THRESHOLD_TOLERANCE)
+
+    @callback
+    def _async_write_avoided(self, message: str, *args) -> None:
+        """Count a write that was skipped because the device already matches."""
+        LOGGER.debug(message, *args)
+        self.writes_avoided += 1
+        self.async_update_listeners()
+
+    async def async_set_target_temperature(
+        self, target_temperature: float, force: bool = False, refresh: bool = True
+    ) -> None:
+        """Set the target temperature unless the device already uses it.
+
+        Pass `force=True` to write even if the last known settings match, e.g.
+        when the device may have been changed outside of Home Assistant, and
+        `refresh=False` when the caller refreshes the data itself.
+        """
+        client = self.config_entry.runtime_data.client
+        overtemp, undertemp = client.thresholds_for(target_temperature)
+        if not force and self._thresholds_match(overtemp, undertemp):
+            self._async_write_avoided(
+                "Thresholds %s/%s already set on the device, skipping write",
+                overtemp,
+                undertemp,
+            )
+            return
+        await self._async_write(client.async_set_thresholds(overtemp, undertemp))
+        # Keep the snapshot in line with what was just written until the
+        # refresh below lands, so that a quick follow-up request is compared
+        # against the new thresholds rather than the stale ones.
+        if self.data:
+            self.data["overtemp_threshold"] = overtemp
+            self.data["undertemp_threshold"] = undertemp
+            self.data["target_temperature"] = client.target_from_thresholds(
+                overtemp, undertemp
+            )
+        if refresh:
+            await self.async_request_refresh()
+
+    async def async_set_hvac_mode(
+        self, mode: str, force: bool = False, refresh: bool = True
+    ) -> None:
+        """Set the hvac mode unless the device already uses it."""
+        if not force and self.data and self.data.get("hvac_mode") == mode:
+            self._async_write_avoided(
+                "Hvac mode %s already set on the device, skipping write", mode
+            )
+            return
+        await self._async_write(
+            self.config_entry.runtime_data.client.async_set_hvac_mode(mode)
+        )
+        if self.data:
+            self.data["hvac_mode"] = mode
+        if refresh:
+            await self.async_request_refresh()
+
+    async def _async_write(self, write: Coroutine[Any, Any, None]) -> None:
+        """Run a settings write and count it."""
+        try:
+            await write
+        except ShellyThermostatApiClientError as exception:
+            raise HomeAssistantError(str(exception)) from exception
+        self.writes_sent += 1
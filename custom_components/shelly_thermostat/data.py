@@ -9,7 +9,7 @@ if TYPE_CHECKING:
     from homeassistant.config_entries import ConfigEntry
     from homeassistant.loader import Integration
 
-    from .api import ShellyApiClient
+    from .api import ShellyBaseApiClient
     from .coordinator import ShellyDataUpdateCoordinator
 
 
@@ -20,6 +20,6 @@ type ShellyThermostatConfigEntry = ConfigEntry[ShellyThermostatData]
 class ShellyThermostatData:
     """Data for the shelly thermostat integration."""
 
-    client: ShellyApiClient
+    client: ShellyBaseApiClient
     coordinator: ShellyDataUpdateCoordinator
     integration: Integration
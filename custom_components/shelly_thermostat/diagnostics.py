@@ -0,0 +1,81 @@
+"""Diagnostics support for shelly thermostat."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.const import CONF_HOST
+
+from .api import ShellyThermostatApiClientError
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .data import ShellyThermostatConfigEntry
+
+# The address, the MAC address and the Wi-Fi fields of the Gen1 and Gen2
+# payloads
+TO_REDACT = {
+    CONF_HOST,
+    "mac",
+    "hostname",
+    "mqtt_id",
+    "wifi_ap",
+    "wifi_sta",
+    "wifi_sta1",
+    "ssid",
+    "bssid",
+    "sta_ip",
+    "pass",
+}
+# The fields of the MQTT settings, the Gen1 id, the Gen2 client id and topic
+# prefix contain the MAC address. "id" is only redacted in the MQTT settings,
+# as other ids like the one of a webhook are useful.
+MQTT_TO_REDACT = {"id", "client_id", "topic_prefix", "user"}
+
+
+def _redact_mqtt(data: Any) -> Any:
+    """Return the data with the fields of the MQTT settings redacted."""
+    if isinstance(data, list):
+        return [_redact_mqtt(item) for item in data]
+    if not isinstance(data, dict):
+        return data
+    return {
+        key: async_redact_data(value, MQTT_TO_REDACT)
+        if key == "mqtt"
+        else _redact_mqtt(value)
+        for key, value in data.items()
+    }
+
+
+def _redact(data: Any) -> Any:
+    """Return the data with the sensitive fields redacted."""
+    return _redact_mqtt(async_redact_data(data, TO_REDACT))
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant,
+    entry: ShellyThermostatConfigEntry,
+) -> dict[str, Any]:
+    """Return the diagnostics of a config entry.
+
+    The raw device responses are taken from the payload history if it is
+    enabled in the options, otherwise they are fetched from the device now.
+    """
+    client = entry.runtime_data.client
+    coordinator = entry.runtime_data.coordinator
+    if client.payloads is not None:
+        payloads: Any = list(client.payloads)
+    else:
+        try:
+            payloads = await client.async_get_raw_data()
+        except ShellyThermostatApiClientError as exception:
+            payloads = {"error": str(exception)}
+    return {
+        "entry": {"data": _redact(dict(entry.data)), "options": dict(entry.options)},
+        "data": _redact(coordinator.data or {}),
+        "writes_sent": coordinator.writes_sent,
+        "writes_avoided": coordinator.writes_avoided,
+        "payloads": _redact(payloads),
+    }
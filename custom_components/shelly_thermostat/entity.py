@@ -19,7 +19,7 @@ class ShellyThermostatEntity(CoordinatorEntity):
     @property
     def device_info(self):
         return DeviceInfo(
-            identifiers={(DOMAIN, self.unique_id)},
+            identifiers={(DOMAIN, self.coordinator.data.get("mac"))},
             name=self.coordinator.data.get("name"),
             model=self.coordinator.data.get("model"),
             manufacturer=MANUFACTURER,
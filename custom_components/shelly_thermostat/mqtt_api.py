@@ -0,0 +1,113 @@
+"""API Client for Gen1 devices publishing their status over MQTT."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components import mqtt
+from homeassistant.core import callback
+
+from .api import (
+    ShellyApiClient,
+    ShellyThermostatApiClientError,
+    ShellyThermostatMqttDisabledError,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from homeassistant.components.mqtt import ReceiveMessage
+    from homeassistant.config_entries import ConfigEntry
+    from homeassistant.core import HomeAssistant
+
+RELAY_STATES = {"on": True, "off": False}
+
+
+class ShellyMqttApiClient(ShellyApiClient):
+    """API client for Gen1 devices with the built-in MQTT publisher enabled.
+
+    The temperature and relay state are received on the `shellies/<id>/...`
+    topics through the MQTT integration and kept between the polls, which
+    then only read the thresholds and actions from `/settings` over HTTP.
+    Settings are still written over HTTP, as Gen1 devices only accept relay
+    commands over MQTT.
+    """
+
+    def __init__(self, hass: HomeAssistant, *args: Any, **kwargs: Any) -> None:
+        """Initialize."""
+        super().__init__(*args, **kwargs)
+        self._hass = hass
+        self._status_data: dict = {}
+        self._mqtt_id: str | None = None
+        self._unsubscribe: list[Callable[[], None]] = []
+
+    async def async_get_data(self) -> dict:
+        """Return the polled settings, and the status while it is not pushed.
+
+        The coordinator keeps the pushed status between the polls.
+        """
+        if not self._unsubscribe or not mqtt.is_connected(self._hass):
+            status_data = await self.async_get_status_data()
+            self._status_data = {
+                key: status_data[key] for key in ("temperature", "output")
+            }
+        else:
+            status_data = {}
+        settings_data = await self.async_get_settings_data()
+        self._mqtt_id = settings_data["mqtt_id"]
+        return {**status_data, **settings_data}
+
+    async def async_start(
+        self,
+        entry: ConfigEntry,
+        on_update: Callable[[dict], None],
+        on_connection: Callable[[bool], None],
+    ) -> None:
+        """Subscribe to the status topics of the device."""
+        if not await mqtt.async_wait_for_mqtt_client(self._hass):
+            raise ShellyThermostatApiClientError("The MQTT integration is not set up")
+        if self._mqtt_id is None:
+            raise ShellyThermostatMqttDisabledError(
+                f"MQTT is not enabled on the device {self._host}"
+            )
+
+        @callback
+        def _async_update(key: str, value: Any) -> None:
+            if self._status_data.get(key) == value:
+                return
+            self._status_data[key] = value
+            on_update({key: value})
+
+        @callback
+        def _async_temperature_received(message: ReceiveMessage) -> None:
+            try:
+                temperature = float(message.payload)
+            except ValueError:
+                return
+            # The device publishes the temperature periodically, an unchanged
+            # reading is passed on as well to show that it is still current
+            self._status_data["temperature"] = temperature
+            on_update({"temperature": temperature})
+
+        @callback
+        def _async_relay_received(message: ReceiveMessage) -> None:
+            if (output := RELAY_STATES.get(message.payload)) is not None:
+                _async_update("output", output)
+
+        topic = f"shellies/{self._mqtt_id}"
+        self._unsubscribe = [
+            # The status is only pushed while the broker is connected
+            mqtt.async_subscribe_connection_status(self._hass, on_connection),
+            await mqtt.async_subscribe(
+                self._hass, f"{topic}/ext_temperature/0", _async_temperature_received
+            ),
+            await mqtt.async_subscribe(
+                self._hass, f"{topic}/relay/0", _async_relay_received
+            ),
+        ]
+        on_connection(mqtt.is_connected(self._hass))
+
+    async def async_stop(self) -> None:
+        """Unsubscribe from the status topics."""
+        while self._unsubscribe:
+            self._unsubscribe.pop()()
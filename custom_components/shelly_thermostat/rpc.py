@@ -0,0 +1,360 @@
+"""API Client for Gen2/Gen3 devices using the RPC API."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import itertools
+import re
+import socket
+from typing import TYPE_CHECKING, Any
+
+import aiohttp
+
+from .api import (
+    DISABLED,
+    HVAC_MODE_ACTIONS,
+    RELAY_OFF,
+    RELAY_ON,
+    TIMEOUT,
+    ShellyBaseApiClient,
+    ShellyThermostatApiClientError,
+    hvac_mode_from_actions,
+)
+from .const import LOGGER
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from homeassistant.config_entries import ConfigEntry
+    from homeassistant.core import HomeAssistant
+
+RPC_SOURCE = "shelly_thermostat"
+RECONNECT_INTERVAL = 10
+HEARTBEAT = 55
+
+# The switch driven by the thermostat and the first add-on temperature sensor
+SWITCH_KEY = "switch:0"
+TEMPERATURE_ID = 100
+TEMPERATURE_KEY = f"temperature:{TEMPERATURE_ID}"
+
+# The thermostat is implemented on the device with two webhooks on the
+# temperature sensor, mirroring the Gen1 overtemp and undertemp actions.
+WEBHOOK_EVENT = "temperature.change"
+WEBHOOK_OVERTEMP = "shelly_thermostat_overtemp"
+WEBHOOK_UNDERTEMP = "shelly_thermostat_undertemp"
+WEBHOOK_COMPARISON = {WEBHOOK_OVERTEMP: ">", WEBHOOK_UNDERTEMP: "<"}
+CONDITION_THRESHOLD = re.compile(r"ev\.tC\s*[<>]=?\s*(-?\d+(?:\.\d+)?)")
+SWITCH_URL = "http://127.0.0.1/rpc/Switch.Set?id=0&on={on}"
+
+
+def parse_status(status: dict) -> dict:
+    """Return the data of a (partial) status, only for the keys it contains."""
+    result = {}
+    if (temperature := status.get(TEMPERATURE_KEY)) and "tC" in temperature:
+        # tC is null while the sensor is disconnected
+        tc = temperature["tC"]
+        result["temperature"] = float(tc) if tc is not None else None
+    if (switch := status.get(SWITCH_KEY)) and "output" in switch:
+        result["output"] = switch["output"]
+    if system := status.get("sys"):
+        if "mac" in system:
+            result["mac"] = system["mac"]
+        if "uptime" in system:
+            result["uptime"] = system["uptime"]
+    return result
+
+
+def webhook_action(hook: dict | None) -> str:
+    """Return the threshold action implemented by a webhook."""
+    if hook is None or not hook.get("enable"):
+        return DISABLED
+    urls = hook.get("urls") or [""]
+    return RELAY_ON if urls[0].endswith("on=true") else RELAY_OFF
+
+
+def webhook_threshold(hook: dict | None) -> float | None:
+    """Return the threshold of the condition of a webhook."""
+    if hook is None or not (match := CONDITION_THRESHOLD.search(hook["condition"])):
+        return None
+    return float(match.group(1))
+
+
+class ShellyRpcApiClient(ShellyBaseApiClient):
+    """API client for Gen2/Gen3 devices.
+
+    The client keeps one WebSocket per device, which is used for the RPC calls
+    and on which the device pushes `NotifyStatus` updates. While the WebSocket
+    is down, calls fall back to HTTP and the connection is retried.
+    """
+
+    def __init__(self, hass: HomeAssistant, *args: Any, **kwargs: Any) -> None:
+        """Initialize."""
+        super().__init__(*args, **kwargs)
+        self._hass = hass
+        self._ids = itertools.count(1)
+        self._pending: dict[int, asyncio.Future] = {}
+        self._ws: aiohttp.ClientWebSocketResponse | None = None
+        self._listener: asyncio.Task | None = None
+        self._on_update: Callable[[dict], None] | None = None
+        self._on_connection: Callable[[bool], None] | None = None
+        self._connected = False
+        self._webhooks: dict[str, dict] = {}
+        self._model: str | None = None
+
+    async def async_start(
+        self,
+        entry: ConfigEntry,
+        on_update: Callable[[dict], None],
+        on_connection: Callable[[bool], None],
+    ) -> None:
+        """Connect the WebSocket and start receiving pushed updates."""
+        self._on_update = on_update
+        self._on_connection = on_connection
+        self._listener = entry.async_create_background_task(
+            self._hass, self._async_listen(), f"shelly_thermostat {self._host} rpc"
+        )
+
+    async def async_stop(self) -> None:
+        """Close the WebSocket."""
+        self._on_update = None
+        self._on_connection = None
+        if self._listener is not None:
+            self._listener.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._listener
+            self._listener = None
+
+    async def _async_listen(self) -> None:
+        """Keep the WebSocket connected and dispatch the received messages."""
+        while True:
+            try:
+                async with self._session.ws_connect(
+                    f"http://{self._host}/rpc", heartbeat=HEARTBEAT
+                ) as ws:
+                    self._ws = ws
+                    self._set_connected(True)
+                    # The device only sends notifications to peers which made
+                    # a request, the response is a full status update.
+                    await ws.send_json(self._request("Shelly.GetStatus"))
+                    async for message in ws:
+                        if message.type is aiohttp.WSMsgType.TEXT:
+                            self._receive(message)
+                        elif message.type is aiohttp.WSMsgType.ERROR:
+                            break
+            except (
+                aiohttp.ClientError,
+                TimeoutError,
+                socket.gaierror,
+            ) as exception:
+                LOGGER.debug("WebSocket to %s failed - %s", self._host, exception)
+            except Exception:  # noqa: BLE001
+                # Keep reconnecting, the task must not end on any error
+                LOGGER.exception("Unexpected error on the WebSocket to %s", self._host)
+            finally:
+                self._ws = None
+                self._set_connected(False)
+                for future in self._pending.values():
+                    if not future.done():
+                        future.set_exception(
+                            ShellyThermostatApiClientError(
+                                f"WebSocket to {self._host} closed"
+                            )
+                        )
+                self._pending.clear()
+            await asyncio.sleep(RECONNECT_INTERVAL)
+
+    def _set_connected(self, connected: bool) -> None:
+        """Report a change of the WebSocket connection."""
+        if connected == self._connected:
+            return
+        self._connected = connected
+        if self._on_connection is not None:
+            self._on_connection(connected)
+
+    def _receive(self, message: aiohttp.WSMessage) -> None:
+        """Handle a received message, a bad message does not end the loop."""
+        try:
+            self._handle_message(message.json())
+        except Exception:  # noqa: BLE001
+            LOGGER.exception(
+                "Error handling the message %s from %s", message.data, self._host
+            )
+
+    def _handle_message(self, message: dict) -> None:
+        """Resolve a pending call or forward a pushed status."""
+        if (future := self._pending.pop(message.get("id"), None)) is not None:
+            if future.done():
+                return
+            if "error" in message:
+                future.set_exception(
+                    ShellyThermostatApiClientError(message["error"].get("message"))
+                )
+            else:
+                future.set_result(message.get("result"))
+        elif message.get("method") in ("NotifyStatus", "NotifyFullStatus"):
+            self._push(message.get("params", {}))
+        elif "result" in message:
+            # The response to the request made after connecting
+            self._push(message["result"])
+
+    def _push(self, status: dict) -> None:
+        """Forward the data of a pushed status."""
+        if self._on_update is not None and (changes := parse_status(status)):
+            self._on_update(changes)
+
+    def _request(self, method: str, params: dict | None = None) -> dict:
+        """Return a new RPC request."""
+        return {
+            "id": next(self._ids),
+            "src": RPC_SOURCE,
+            "method": method,
+            "params": params or {},
+        }
+
+    async def async_call(self, method: str, params: dict | None = None) -> Any:
+        """Call an RPC method and return its result."""
+        if (ws := self._ws) is None or ws.closed:
+            return await self._async_call_http(method, params)
+        request = self._request(method, params)
+        future = self._pending[request["id"]] = (
+            asyncio.get_running_loop().create_future()
+        )
+        try:
+            await ws.send_json(request)
+            async with asyncio.timeout(TIMEOUT):
+                return await future
+        except (
+            TimeoutError,
+            aiohttp.ClientError,
+            ConnectionError,
+        ) as exception:
+            raise ShellyThermostatApiClientError(
+                f"Error calling {method} on {self._host} - {exception}"
+            ) from exception
+        finally:
+            self._pending.pop(request["id"], None)
+
+    async def _async_call_http(self, method: str, params: dict | None) -> Any:
+        """Call an RPC method with a HTTP request."""
+        try:
+            async with asyncio.timeout(TIMEOUT):
+                response = await self._session.post(
+                    f"http://{self._host}/rpc", json=self._request(method, params)
+                )
+                message = await response.json(content_type=None)
+        except (
+            TimeoutError,
+            aiohttp.ClientError,
+            socket.gaierror,
+        ) as exception:
+            raise ShellyThermostatApiClientError(
+                f"Error calling {method} on {self._host} - {exception}"
+            ) from exception
+        if "error" in message:
+            raise ShellyThermostatApiClientError(message["error"].get("message"))
+        return message.get("result")
+
+    async def async_get_data(self) -> dict:
+        """Return the current data of the device."""
+        calls = [
+            self.async_call("Shelly.GetStatus"),
+            self.async_call("Shelly.GetConfig"),
+            self.async_call("Webhook.List"),
+        ]
+        if self._model is None:
+            calls.append(self.async_call("Shelly.GetDeviceInfo"))
+        status, config, webhooks, *device_info = await asyncio.gather(*calls)
+        if device_info:
+            self._model = device_info[0].get("model")
+        self._capture("Shelly.GetStatus", status)
+        self._capture("Shelly.GetConfig", config)
+        self._capture("Webhook.List", webhooks)
+
+        self._webhooks = {
+            hook["name"]: hook
+            for hook in webhooks.get("hooks", [])
+            if hook.get("name") in WEBHOOK_COMPARISON
+        }
+        overtemp_hook = self._webhooks.get(WEBHOOK_OVERTEMP)
+        undertemp_hook = self._webhooks.get(WEBHOOK_UNDERTEMP)
+
+        result = parse_status(status)
+        result.setdefault("temperature", None)
+        result.setdefault("output", False)
+        result["hvac_mode"] = hvac_mode_from_actions(
+            webhook_action(overtemp_hook), webhook_action(undertemp_hook)
+        )
+        overtemp_threshold = webhook_threshold(overtemp_hook)
+        undertemp_threshold = webhook_threshold(undertemp_hook)
+        result["overtemp_threshold"] = overtemp_threshold
+        result["undertemp_threshold"] = undertemp_threshold
+        result["target_temperature"] = (
+            self.target_from_thresholds(overtemp_threshold, undertemp_threshold)
+            if overtemp_threshold is not None and undertemp_threshold is not None
+            else None
+        )
+        result["name"] = config.get("sys", {}).get("device", {}).get("name")
+        result["model"] = self._model
+        return result
+
+    async def async_get_raw_data(self) -> dict:
+        """Return the raw responses of the device, for the diagnostics."""
+        methods = (
+            "Shelly.GetDeviceInfo",
+            "Shelly.GetStatus",
+            "Shelly.GetConfig",
+            "Webhook.List",
+        )
+        results = await asyncio.gather(*(self.async_call(method) for method in methods))
+        return dict(zip(methods, results, strict=True))
+
+    async def _async_save_webhook(
+        self, name: str, action: str | None = None, threshold: float | None = None
+    ) -> None:
+        """Create or update a thermostat webhook, keeping the unchanged fields."""
+        hook = self._webhooks.get(name)
+        if action is None:
+            action = webhook_action(hook)
+        if threshold is None:
+            threshold = webhook_threshold(hook)
+        if threshold is None:
+            if action == DISABLED:
+                # Nothing to disable on a device without thermostat webhooks
+                return
+            raise ShellyThermostatApiClientError(
+                f"The thermostat of {self._host} has no thresholds set"
+            )
+        params = {
+            "enable": action != DISABLED,
+            "urls": [SWITCH_URL.format(on="true" if action == RELAY_ON else "false")],
+            "condition": f"ev.tC {WEBHOOK_COMPARISON[name]} {threshold}",
+        }
+        if hook is None:
+            result = await self.async_call(
+                "Webhook.Create",
+                {"cid": TEMPERATURE_ID, "event": WEBHOOK_EVENT, "name": name, **params},
+            )
+            self._webhooks[name] = {"id": result["id"], "name": name, **params}
+        else:
+            await self.async_call("Webhook.Update", {"id": hook["id"], **params})
+            self._webhooks[name] = {**hook, **params}
+
+    async def async_set_thresholds(
+        self, overtemp_threshold: float, undertemp_threshold: float
+    ) -> None:
+        """Set the conditions of both webhooks."""
+        await asyncio.gather(
+            self._async_save_webhook(WEBHOOK_OVERTEMP, threshold=overtemp_threshold),
+            self._async_save_webhook(WEBHOOK_UNDERTEMP, threshold=undertemp_threshold),
+        )
+
+    async def async_set_hvac_mode(self, mode: str) -> None:
+        """Set the switch actions of both webhooks."""
+        if mode not in HVAC_MODE_ACTIONS:
+            return
+        overtemp_action, undertemp_action = HVAC_MODE_ACTIONS[mode]
+        await asyncio.gather(
+            self._async_save_webhook(WEBHOOK_OVERTEMP, action=overtemp_action),
+            self._async_save_webhook(WEBHOOK_UNDERTEMP, action=undertemp_action),
+        )
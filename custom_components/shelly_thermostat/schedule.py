@@ -0,0 +1,224 @@
+"""Weekly setpoint schedules for shelly thermostats."""
+
+from __future__ import annotations
+
+import bisect
+import hashlib
+import json
+from datetime import datetime, time, timedelta
+from typing import TYPE_CHECKING
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import WEEKDAYS
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, LOGGER
+from .zone import async_set_zone
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+    from homeassistant.core import HomeAssistant
+
+    from .coordinator import ShellyDataUpdateCoordinator
+
+STORAGE_KEY = f"{DOMAIN}.schedules"
+STORAGE_VERSION = 1
+SAVE_DELAY = 10
+
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+
+# A transition is (minute of the week, target temperature), Monday 00:00 is 0
+type Transition = tuple[int, float]
+
+
+def minute_of_week(weekday: str | int, at: time) -> int:
+    """Return the minute of the week for a weekday and a time of day."""
+    if isinstance(weekday, str):
+        weekday = WEEKDAYS.index(weekday)
+    return weekday * MINUTES_PER_DAY + at.hour * 60 + at.minute
+
+
+def schedule_id(transitions: tuple[Transition, ...]) -> str:
+    """Return a content based id, equal schedules share the same id."""
+    return hashlib.sha1(
+        json.dumps(transitions, separators=(",", ":")).encode()
+    ).hexdigest()[:12]
+
+
+class WeeklySchedule:
+    """A sorted list of weekly transitions."""
+
+    def __init__(self, transitions: Iterable[Transition]) -> None:
+        """Initialize the schedule, a later transition at the same minute wins."""
+        by_minute = {
+            int(minute): float(temperature) for minute, temperature in transitions
+        }
+        self.transitions: tuple[Transition, ...] = tuple(sorted(by_minute.items()))
+        self._minutes = [minute for minute, _ in self.transitions]
+
+    @property
+    def id(self) -> str:
+        """Return the id of the schedule."""
+        return schedule_id(self.transitions)
+
+    def next_transition(self, now: datetime) -> tuple[datetime, float]:
+        """Return the first transition strictly after `now` (a local datetime)."""
+        current = minute_of_week(now.weekday(), now.time())
+        index = bisect.bisect_right(self._minutes, current)
+        if index == len(self._minutes):
+            index = 0
+        minute, temperature = self.transitions[index]
+        delta = (minute - current) % MINUTES_PER_WEEK or MINUTES_PER_WEEK
+        # Add whole days to the local midnight and the time of day on top, so
+        # that the transition keeps its wall clock time across DST changes.
+        target_minute = current + delta
+        day = dt_util.start_of_local_day(now) + timedelta(
+            days=target_minute // MINUTES_PER_DAY - now.weekday()
+        )
+        at = day.replace(
+            hour=(target_minute % MINUTES_PER_DAY) // 60,
+            minute=target_minute % 60,
+        )
+        return at, temperature
+
+
+class ScheduleManager:
+    """Keep one timer per distinct schedule and apply it to all its devices.
+
+    Devices with identical schedules share a single schedule, so a transition
+    results in one batched zone write for all of them.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize."""
+        self._hass = hass
+        self._store: Store[dict] = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._schedules: dict[str, WeeklySchedule] = {}
+        # config entry id -> schedule id
+        self._assignments: dict[str, str] = {}
+        self._timers: dict[str, Callable[[], None]] = {}
+
+    async def async_load(self) -> None:
+        """Load the stored schedules and arm their timers."""
+        if (data := await self._store.async_load()) is None:
+            return
+        for stored_id, transitions in data.get("schedules", {}).items():
+            schedule = WeeklySchedule(tuple(transition) for transition in transitions)
+            if stored_id != schedule.id:
+                LOGGER.warning("Ignoring the corrupt stored schedule %s", stored_id)
+                continue
+            self._schedules[stored_id] = schedule
+        self._assignments = {
+            entry_id: assigned
+            for entry_id, assigned in data.get("assignments", {}).items()
+            if assigned in self._schedules
+        }
+        for assigned in set(self._assignments.values()):
+            self._async_arm(assigned)
+
+    @callback
+    def async_unload(self) -> None:
+        """Cancel all timers."""
+        for cancel in self._timers.values():
+            cancel()
+        self._timers.clear()
+
+    @callback
+    def async_get_schedule(self, entry_id: str) -> WeeklySchedule | None:
+        """Return the schedule of a config entry."""
+        if (assigned := self._assignments.get(entry_id)) is None:
+            return None
+        return self._schedules[assigned]
+
+    @callback
+    def async_set_schedule(
+        self, entry_ids: Iterable[str], transitions: Iterable[Transition]
+    ) -> str:
+        """Assign the schedule to the config entries and return its id."""
+        schedule = WeeklySchedule(transitions)
+        if schedule.id not in self._schedules:
+            self._schedules[schedule.id] = schedule
+            self._async_arm(schedule.id)
+        for entry_id in entry_ids:
+            self._assignments[entry_id] = schedule.id
+        self._async_remove_unused()
+        self._async_schedule_save()
+        return schedule.id
+
+    @callback
+    def async_clear_schedule(self, entry_ids: Iterable[str]) -> None:
+        """Remove the schedule of the config entries."""
+        for entry_id in entry_ids:
+            self._assignments.pop(entry_id, None)
+        self._async_remove_unused()
+        self._async_schedule_save()
+
+    @callback
+    def _async_remove_unused(self) -> None:
+        """Drop the schedules which are no longer assigned to any device."""
+        used = set(self._assignments.values())
+        for unused in set(self._schedules) - used:
+            del self._schedules[unused]
+            if cancel := self._timers.pop(unused, None):
+                cancel()
+
+    @callback
+    def _async_arm(self, assigned: str) -> None:
+        """Arm the timer for the next transition of a schedule."""
+        if cancel := self._timers.pop(assigned, None):
+            cancel()
+        at, temperature = self._schedules[assigned].next_transition(dt_util.now())
+        LOGGER.debug(
+            "Next transition of schedule %s at %s to %s", assigned, at, temperature
+        )
+
+        async def _async_fire(now: datetime) -> None:
+            self._timers.pop(assigned, None)
+            if assigned not in self._schedules:
+                return
+            await self._async_apply(assigned, temperature)
+            if assigned in self._schedules and assigned not in self._timers:
+                self._async_arm(assigned)
+
+        self._timers[assigned] = async_track_point_in_utc_time(
+            self._hass, _async_fire, dt_util.as_utc(at)
+        )
+
+    async def _async_apply(self, assigned: str, temperature: float) -> None:
+        """Write the temperature to all loaded devices of the schedule."""
+        coordinators: dict[str, ShellyDataUpdateCoordinator] = {}
+        for entry_id, entry_schedule in self._assignments.items():
+            if entry_schedule != assigned:
+                continue
+            entry = self._hass.config_entries.async_get_entry(entry_id)
+            if entry is not None and entry.state is ConfigEntryState.LOADED:
+                coordinators[entry_id] = entry.runtime_data.coordinator
+        if not coordinators:
+            return
+        results = await async_set_zone(coordinators, temperature=temperature)
+        failed = [entry_id for entry_id, error in results.items() if error]
+        if failed:
+            LOGGER.warning(
+                "Schedule %s could not set %s on %s", assigned, temperature, failed
+            )
+
+    @callback
+    def _async_schedule_save(self) -> None:
+        """Save the schedules with a delay to bundle several changes."""
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict:
+        """Return the compact representation to store."""
+        return {
+            "schedules": {
+                stored_id: [list(transition) for transition in schedule.transitions]
+                for stored_id, schedule in self._schedules.items()
+            },
+            "assignments": self._assignments,
+        }
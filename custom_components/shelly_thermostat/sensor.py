@@ -0,0 +1,217 @@
+"""Sensor platform for shelly_thermostat."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.const import EntityCategory, UnitOfTemperature, UnitOfTime
+from homeassistant.util import dt as dt_util
+
+from .entity import ShellyThermostatEntity
+from .stats import WINDOWS
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+    from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+    from .coordinator import ShellyDataUpdateCoordinator
+    from .data import ShellyThermostatConfigEntry
+
+
+@dataclass(frozen=True, kw_only=True)
+class ShellyThermostatSensorEntityDescription(SensorEntityDescription):
+    """Describes a Shelly Thermostat sensor."""
+
+    value_fn: Callable[[ShellyDataUpdateCoordinator], Any]
+
+
+def _minutes_to_target(coordinator: ShellyDataUpdateCoordinator) -> float | None:
+    """Return the estimated minutes to reach the target temperature."""
+    if (hours := coordinator.hours_to_target()) is None:
+        return None
+    return round(hours * 60, 1)
+
+
+def _rate(active: bool) -> Callable[[ShellyDataUpdateCoordinator], float | None]:
+    """Return the value function of the estimated rate of a relay state."""
+
+    def _value(coordinator: ShellyDataUpdateCoordinator) -> float | None:
+        if (temperature := coordinator.data.get("temperature")) is None:
+            return None
+        thermal = coordinator.thermal
+        rate = (thermal.active if active else thermal.idle).rate(temperature)
+        return None if rate is None else round(rate, 3)
+
+    return _value
+
+
+ENTITY_DESCRIPTIONS = (
+    ShellyThermostatSensorEntityDescription(
+        key="writes_avoided",
+        name="Writes avoided",
+        has_entity_name=True,
+        icon="mdi:content-save-off-outline",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda coordinator: coordinator.writes_avoided,
+    ),
+    ShellyThermostatSensorEntityDescription(
+        key="writes_sent",
+        name="Writes sent",
+        has_entity_name=True,
+        icon="mdi:content-save-outline",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_registry_enabled_default=False,
+        value_fn=lambda coordinator: coordinator.writes_sent,
+    ),
+    ShellyThermostatSensorEntityDescription(
+        key="time_to_target",
+        name="Time to target",
+        has_entity_name=True,
+        icon="mdi:timer-sand",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MINUTES,
+        suggested_display_precision=0,
+        value_fn=_minutes_to_target,
+    ),
+    ShellyThermostatSensorEntityDescription(
+        key="active_rate",
+        name="Active rate",
+        has_entity_name=True,
+        icon="mdi:thermometer-chevron-up",
+        native_unit_of_measurement="°C/h",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+        value_fn=_rate(active=True),
+    ),
+    ShellyThermostatSensorEntityDescription(
+        key="idle_rate",
+        name="Idle rate",
+        has_entity_name=True,
+        icon="mdi:thermometer-chevron-down",
+        native_unit_of_measurement="°C/h",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+        value_fn=_rate(active=False),
+    ),
+)
+
+
+def _window_value(
+    window: str, statistic: str
+) -> Callable[[ShellyDataUpdateCoordinator], float | None]:
+    """Return the value function of a statistic over a window."""
+
+    def _value(coordinator: ShellyDataUpdateCoordinator) -> float | None:
+        aggregator = coordinator.statistics.windows[window]
+        value = getattr(aggregator, statistic)(dt_util.utcnow().timestamp())
+        if value is None:
+            return None
+        if statistic == "on_time":
+            return round(value / 3600, 3)
+        return round(value, 2)
+
+    return _value
+
+
+def _window_descriptions(
+    window: str,
+) -> tuple[ShellyThermostatSensorEntityDescription, ...]:
+    """Return the statistics sensors of a window.
+
+    Only the 24h sensors are enabled by default.
+    """
+    enabled = window == "24h"
+    temperature_statistics = (
+        ("minimum", "Minimum temperature", "mdi:thermometer-chevron-down"),
+        ("maximum", "Maximum temperature", "mdi:thermometer-chevron-up"),
+        ("mean", "Mean temperature", "mdi:thermometer"),
+    )
+    return (
+        *(
+            ShellyThermostatSensorEntityDescription(
+                key=f"temperature_{statistic}_{window}",
+                name=f"{name} {window}",
+                has_entity_name=True,
+                icon=icon,
+                device_class=SensorDeviceClass.TEMPERATURE,
+                native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+                state_class=SensorStateClass.MEASUREMENT,
+                suggested_display_precision=1,
+                entity_registry_enabled_default=enabled,
+                value_fn=_window_value(window, statistic),
+            )
+            for statistic, name, icon in temperature_statistics
+        ),
+        ShellyThermostatSensorEntityDescription(
+            key=f"relay_on_time_{window}",
+            name=f"Relay on-time {window}",
+            has_entity_name=True,
+            icon="mdi:timer-outline",
+            device_class=SensorDeviceClass.DURATION,
+            native_unit_of_measurement=UnitOfTime.HOURS,
+            state_class=SensorStateClass.MEASUREMENT,
+            suggested_display_precision=2,
+            entity_registry_enabled_default=enabled,
+            value_fn=_window_value(window, "on_time"),
+        ),
+    )
+
+
+WINDOW_ENTITY_DESCRIPTIONS = tuple(
+    description for window in WINDOWS for description in _window_descriptions(window)
+)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ShellyThermostatConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up the sensor platform."""
+    async_add_entities(
+        ShellyThermostatSensor(
+            coordinator=entry.runtime_data.coordinator,
+            entry=entry,
+            entity_description=entity_description,
+        )
+        for entity_description in (*ENTITY_DESCRIPTIONS, *WINDOW_ENTITY_DESCRIPTIONS)
+    )
+
+
+class ShellyThermostatSensor(ShellyThermostatEntity, SensorEntity):
+    """Shelly Thermostat sensor class."""
+
+    entity_description: ShellyThermostatSensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: ShellyDataUpdateCoordinator,
+        entry: ShellyThermostatConfigEntry,
+        entity_description: ShellyThermostatSensorEntityDescription,
+    ):
+        """Initialize the sensor."""
+        self.entity_description = entity_description
+
+        super().__init__(coordinator, entry)
+
+    @property
+    def unique_id(self):
+        """Return a unique ID to use for this entity."""
+        return f"{super().unique_id}_{self.entity_description.key}"
+
+    @property
+    def native_value(self):
+        """Return the state of the sensor."""
+        return self.entity_description.value_fn(self.coordinator)
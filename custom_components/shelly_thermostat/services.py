@@ -0,0 +1,216 @@
+"""Services for shelly_thermostat."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import voluptuous as vol
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import (
+    ATTR_ENTITY_ID,
+    ATTR_TEMPERATURE,
+    ATTR_TIME,
+    WEEKDAYS,
+    Platform,
+)
+from homeassistant.core import ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
+
+from .api import HVAC_MODE_ACTIONS
+from .const import (
+    ATTR_DAYS,
+    ATTR_DEADLINE,
+    ATTR_FORCE,
+    ATTR_HVAC_MODE,
+    ATTR_MAX_CONCURRENCY,
+    ATTR_SCHEDULE,
+    DEFAULT_ZONE_CONCURRENCY,
+    DOMAIN,
+    MAX_TARGET_TEMPERATURE,
+    MIN_TARGET_TEMPERATURE,
+    SERVICE_CLEAR_SCHEDULE,
+    SERVICE_REACH_TARGET_BY,
+    SERVICE_SET_SCHEDULE,
+    SERVICE_SET_ZONE,
+)
+from .schedule import minute_of_week
+from .zone import async_set_zone
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .data import ShellyThermostatConfigEntry
+
+
+# The same limits as the climate entities
+TARGET_TEMPERATURE_SCHEMA = vol.All(
+    vol.Coerce(float),
+    vol.Range(min=MIN_TARGET_TEMPERATURE, max=MAX_TARGET_TEMPERATURE),
+)
+
+SET_ZONE_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Required(ATTR_ENTITY_ID): cv.entity_ids,
+            vol.Optional(ATTR_TEMPERATURE): TARGET_TEMPERATURE_SCHEMA,
+            vol.Optional(ATTR_HVAC_MODE): vol.In(list(HVAC_MODE_ACTIONS)),
+            vol.Optional(ATTR_FORCE, default=False): cv.boolean,
+            vol.Optional(
+                ATTR_MAX_CONCURRENCY, default=DEFAULT_ZONE_CONCURRENCY
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=64)),
+        }
+    ),
+    cv.has_at_least_one_key(ATTR_TEMPERATURE, ATTR_HVAC_MODE),
+)
+
+SCHEDULE_TRANSITION_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_DAYS, default=WEEKDAYS): cv.weekdays,
+        vol.Required(ATTR_TIME): cv.time,
+        vol.Required(ATTR_TEMPERATURE): TARGET_TEMPERATURE_SCHEMA,
+    }
+)
+
+SET_SCHEDULE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_ENTITY_ID): cv.entity_ids,
+        vol.Required(ATTR_SCHEDULE): vol.All(
+            cv.ensure_list, [SCHEDULE_TRANSITION_SCHEMA], vol.Length(min=1)
+        ),
+    }
+)
+
+CLEAR_SCHEDULE_SCHEMA = vol.Schema({vol.Required(ATTR_ENTITY_ID): cv.entity_ids})
+
+REACH_TARGET_BY_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_ENTITY_ID): cv.entity_ids,
+        vol.Required(ATTR_TEMPERATURE): TARGET_TEMPERATURE_SCHEMA,
+        vol.Required(ATTR_DEADLINE): cv.datetime,
+    }
+)
+
+
+def async_get_entries(
+    hass: HomeAssistant, entity_ids: list[str]
+) -> tuple[dict[str, ShellyThermostatConfigEntry], dict[str, str]]:
+    """Return the loaded config entries of the thermostat entities.
+
+    The second dict contains the error message for each entity which is not a
+    loaded shelly thermostat climate entity.
+    """
+    registry = er.async_get(hass)
+    entries: dict[str, ShellyThermostatConfigEntry] = {}
+    errors: dict[str, str] = {}
+    for entity_id in entity_ids:
+        entity = registry.async_get(entity_id)
+        if (
+            entity is None
+            or entity.platform != DOMAIN
+            or entity.domain != Platform.CLIMATE
+        ):
+            errors[entity_id] = "Not a shelly thermostat climate entity"
+            continue
+        entry = hass.config_entries.async_get_entry(entity.config_entry_id)
+        if entry is None or entry.state is not ConfigEntryState.LOADED:
+            errors[entity_id] = "The thermostat is not loaded"
+            continue
+        entries[entity_id] = entry
+    return entries, errors
+
+
+def async_get_valid_entries(
+    hass: HomeAssistant, entity_ids: list[str]
+) -> list[ShellyThermostatConfigEntry]:
+    """Return the config entries of the thermostat entities, raise on errors."""
+    entries, errors = async_get_entries(hass, entity_ids)
+    if errors:
+        raise ServiceValidationError(
+            ", ".join(f"{entity_id}: {error}" for entity_id, error in errors.items())
+        )
+    return list(entries.values())
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services of the integration."""
+
+    async def async_handle_set_zone(call: ServiceCall) -> ServiceResponse:
+        """Set the hvac mode and/or target temperature of many thermostats."""
+        entries, errors = async_get_entries(hass, call.data[ATTR_ENTITY_ID])
+        results = await async_set_zone(
+            {
+                entity_id: entry.runtime_data.coordinator
+                for entity_id, entry in entries.items()
+            },
+            temperature=call.data.get(ATTR_TEMPERATURE),
+            hvac_mode=call.data.get(ATTR_HVAC_MODE),
+            force=call.data[ATTR_FORCE],
+            max_concurrency=call.data[ATTR_MAX_CONCURRENCY],
+        )
+        results.update(errors)
+        return {
+            entity_id: (
+                {"success": True}
+                if error is None
+                else {"success": False, "error": error}
+            )
+            for entity_id, error in results.items()
+        }
+
+    async def async_handle_set_schedule(call: ServiceCall) -> None:
+        """Assign a weekly schedule to thermostats."""
+        entries = async_get_valid_entries(hass, call.data[ATTR_ENTITY_ID])
+        hass.data[DOMAIN].async_set_schedule(
+            (entry.entry_id for entry in entries),
+            (
+                (
+                    minute_of_week(day, transition[ATTR_TIME]),
+                    transition[ATTR_TEMPERATURE],
+                )
+                for transition in call.data[ATTR_SCHEDULE]
+                for day in transition[ATTR_DAYS]
+            ),
+        )
+
+    async def async_handle_clear_schedule(call: ServiceCall) -> None:
+        """Remove the weekly schedule of thermostats."""
+        entries = async_get_valid_entries(hass, call.data[ATTR_ENTITY_ID])
+        hass.data[DOMAIN].async_clear_schedule(entry.entry_id for entry in entries)
+
+    async def async_handle_reach_target_by(call: ServiceCall) -> None:
+        """Preheat thermostats just in time to reach a temperature by a deadline."""
+        entries = async_get_valid_entries(hass, call.data[ATTR_ENTITY_ID])
+        deadline = dt_util.as_utc(call.data[ATTR_DEADLINE])
+        for entry in entries:
+            entry.runtime_data.coordinator.async_reach_target_by(
+                call.data[ATTR_TEMPERATURE], deadline
+            )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_SCHEDULE,
+        async_handle_set_schedule,
+        schema=SET_SCHEDULE_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_CLEAR_SCHEDULE,
+        async_handle_clear_schedule,
+        schema=CLEAR_SCHEDULE_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_ZONE,
+        async_handle_set_zone,
+        schema=SET_ZONE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_REACH_TARGET_BY,
+        async_handle_reach_target_by,
+        schema=REACH_TARGET_BY_SCHEMA,
+    )
@@ -0,0 +1,212 @@
+"""Sliding window temperature and relay statistics of a shelly thermostat."""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import astuple, dataclass
+
+# Name and length in seconds of the windows
+WINDOWS = {"1h": 3600, "24h": 24 * 3600, "7d": 7 * 24 * 3600}
+# Each window is kept in this many buckets, which bounds the memory per
+# window and makes the window slide in steps of 1/BUCKETS of its length.
+BUCKETS = 60
+# Longer intervals between two samples are gaps in the data, e.g. while Home
+# Assistant was stopped, and are not counted.
+MAX_INTERVAL = 15 * 60
+
+
+@dataclass(slots=True)
+class Bucket:
+    """The aggregated samples of a part of a window."""
+
+    start: float
+    minimum: float | None = None
+    maximum: float | None = None
+    # Sum of the temperatures weighted by how long they were measured
+    weighted_sum: float = 0.0
+    duration: float = 0.0
+    on_time: float = 0.0
+
+    def add_reading(self, temperature: float) -> None:
+        """Add a temperature reading to the minimum and maximum."""
+        if self.minimum is None or temperature < self.minimum:
+            self.minimum = temperature
+        if self.maximum is None or temperature > self.maximum:
+            self.maximum = temperature
+
+    def add_interval(
+        self, seconds: float, temperature: float | None, output: bool
+    ) -> None:
+        """Add how long a temperature and relay state lasted."""
+        if temperature is not None:
+            self.weighted_sum += temperature * seconds
+            self.duration += seconds
+        if output:
+            self.on_time += seconds
+
+
+class WindowAggregator:
+    """Minimum, maximum, mean temperature and relay on-time over a window.
+
+    The closed buckets are kept in a deque with running sums and monotonic
+    deques of their minimums and maximums, so that adding a sample and reading
+    the statistics take amortized constant time.
+    """
+
+    def __init__(self, window: float, buckets: int = BUCKETS) -> None:
+        """Initialize."""
+        self.window = window
+        self.width = window / buckets
+        self._buckets: deque[Bucket] = deque()
+        self._current: Bucket | None = None
+        # (bucket start, value), increasing resp. decreasing values
+        self._minimums: deque[tuple[float, float]] = deque()
+        self._maximums: deque[tuple[float, float]] = deque()
+        self._weighted_sum = 0.0
+        self._duration = 0.0
+        self._on_time = 0.0
+
+    def _bucket(self, timestamp: float) -> Bucket:
+        """Return the bucket of a timestamp, closing the previous one."""
+        start = timestamp - timestamp % self.width
+        if self._current is None:
+            self._current = Bucket(start)
+        elif start > self._current.start:
+            self._close(self._current)
+            self._current = Bucket(start)
+        self._evict(timestamp)
+        return self._current
+
+    def _close(self, bucket: Bucket) -> None:
+        """Add a finished bucket to the window."""
+        self._buckets.append(bucket)
+        self._weighted_sum += bucket.weighted_sum
+        self._duration += bucket.duration
+        self._on_time += bucket.on_time
+        if bucket.minimum is not None:
+            while self._minimums and self._minimums[-1][1] >= bucket.minimum:
+                self._minimums.pop()
+            self._minimums.append((bucket.start, bucket.minimum))
+        if bucket.maximum is not None:
+            while self._maximums and self._maximums[-1][1] <= bucket.maximum:
+                self._maximums.pop()
+            self._maximums.append((bucket.start, bucket.maximum))
+
+    def _evict(self, timestamp: float) -> None:
+        """Drop the buckets which left the window."""
+        while self._buckets and self._buckets[0].start + self.window <= timestamp:
+            bucket = self._buckets.popleft()
+            self._weighted_sum -= bucket.weighted_sum
+            self._duration -= bucket.duration
+            self._on_time -= bucket.on_time
+            if self._minimums and self._minimums[0][0] == bucket.start:
+                self._minimums.popleft()
+            if self._maximums and self._maximums[0][0] == bucket.start:
+                self._maximums.popleft()
+        if not self._buckets:
+            # Avoid drifting away from 0 through the float subtractions
+            self._weighted_sum = self._duration = self._on_time = 0.0
+
+    def add_reading(self, timestamp: float, temperature: float) -> None:
+        """Add a temperature reading."""
+        self._bucket(timestamp).add_reading(temperature)
+
+    def add_interval(
+        self, timestamp: float, seconds: float, temperature: float | None, output: bool
+    ) -> None:
+        """Add an interval ending at `timestamp`."""
+        self._bucket(timestamp).add_interval(seconds, temperature, output)
+
+    def minimum(self, timestamp: float) -> float | None:
+        """Return the minimum temperature in the window."""
+        values = [self._bucket(timestamp).minimum]
+        if self._minimums:
+            values.append(self._minimums[0][1])
+        return min((value for value in values if value is not None), default=None)
+
+    def maximum(self, timestamp: float) -> float | None:
+        """Return the maximum temperature in the window."""
+        values = [self._bucket(timestamp).maximum]
+        if self._maximums:
+            values.append(self._maximums[0][1])
+        return max((value for value in values if value is not None), default=None)
+
+    def mean(self, timestamp: float) -> float | None:
+        """Return the time weighted mean temperature in the window."""
+        current = self._bucket(timestamp)
+        duration = self._duration + current.duration
+        if duration <= 0:
+            return None
+        return (self._weighted_sum + current.weighted_sum) / duration
+
+    def on_time(self, timestamp: float) -> float:
+        """Return the seconds the relay was on in the window."""
+        return self._on_time + self._bucket(timestamp).on_time
+
+    def as_list(self) -> list[list]:
+        """Return the buckets to store."""
+        buckets = [*self._buckets]
+        if self._current is not None:
+            buckets.append(self._current)
+        return [list(astuple(bucket)) for bucket in buckets]
+
+    def restore(self, buckets: list[list]) -> None:
+        """Restore the stored buckets."""
+        for stored in buckets:
+            bucket = Bucket(*stored)
+            if self._current is not None:
+                self._close(self._current)
+            self._current = bucket
+
+
+class ThermostatStatistics:
+    """The statistics of all windows of a thermostat."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.windows = {
+            name: WindowAggregator(length) for name, length in WINDOWS.items()
+        }
+        # (timestamp, temperature, output) of the last sample
+        self._last: tuple[float, float | None, bool] | None = None
+
+    def add_sample(
+        self, timestamp: float, temperature: float | None, output: bool
+    ) -> None:
+        """Add a sample, `timestamp` is a POSIX timestamp in seconds.
+
+        The temperature and relay state of the previous sample are counted
+        until this one, a `None` temperature is not counted for the mean.
+        """
+        if self._last is not None:
+            last_timestamp, last_temperature, last_output = self._last
+            if 0 < (seconds := timestamp - last_timestamp) <= MAX_INTERVAL:
+                for window in self.windows.values():
+                    window.add_interval(
+                        timestamp, seconds, last_temperature, last_output
+                    )
+        if temperature is not None:
+            for window in self.windows.values():
+                window.add_reading(timestamp, temperature)
+        self._last = (timestamp, temperature, output)
+
+    def as_dict(self) -> dict:
+        """Return the state of the statistics to store."""
+        return {
+            "last": list(self._last) if self._last is not None else None,
+            "windows": {
+                name: window.as_list() for name, window in self.windows.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> ThermostatStatistics:
+        """Restore stored statistics."""
+        statistics = cls()
+        if data.get("last") is not None:
+            timestamp, temperature, output = data["last"]
+            statistics._last = (timestamp, temperature, output)
+        for name, buckets in data.get("windows", {}).items():
+            if name in statistics.windows:
+                statistics.windows[name].restore(buckets)
+        return statistics
@@ -0,0 +1,173 @@
+"""Online thermal model of a room controlled by a shelly thermostat."""
+
+from __future__ import annotations
+
+import math
+
+from .api import HVAC_MODE_COOL, HVAC_MODE_HEAT
+
+# The rates are fitted around this temperature to keep the fit well conditioned
+REFERENCE_TEMPERATURE = 20.0
+# Older samples lose weight, so the model follows e.g. the seasons
+FORGETTING_FACTOR = 0.998
+INITIAL_COVARIANCE = 100.0
+# Forgetting is paused above this covariance trace, which would otherwise grow
+# without bounds while the temperature stays about the same (no excitation).
+MAX_COVARIANCE = 1e4
+MIN_SLOPE = 1e-3
+# An estimate is only used after this many samples
+MIN_SAMPLES = 5
+
+# Seconds between two samples used for a rate, shorter intervals are mostly
+# sensor noise and longer ones are gaps in the data.
+MIN_SAMPLE_INTERVAL = 120
+MAX_SAMPLE_INTERVAL = 1800
+
+
+class RateEstimator:
+    """Recursive least squares fit of the rate of change of the temperature.
+
+    The rate (°C/h) is modelled as `a + b * (T - 20)`, as a room heats up
+    slower and cools down faster the warmer it is. Each sample updates the fit
+    in constant time and memory, no history is kept.
+    """
+
+    def __init__(
+        self,
+        theta: tuple[float, float] = (0.0, 0.0),
+        covariance: tuple[float, float, float] = (
+            INITIAL_COVARIANCE,
+            0.0,
+            INITIAL_COVARIANCE,
+        ),
+        samples: int = 0,
+    ) -> None:
+        """Initialize, by default without any knowledge about the room."""
+        self._a, self._b = theta
+        # The upper triangle of the symmetric 2x2 covariance matrix
+        self._p00, self._p01, self._p11 = covariance
+        self.samples = samples
+
+    def update(self, temperature: float, rate: float) -> None:
+        """Add an observed rate at a temperature to the fit."""
+        x = temperature - REFERENCE_TEMPERATURE
+        # P·φ with the regressor φ = (1, x)
+        k0 = self._p00 + self._p01 * x
+        k1 = self._p01 + self._p11 * x
+        forgetting = (
+            FORGETTING_FACTOR if self._p00 + self._p11 < MAX_COVARIANCE else 1.0
+        )
+        denominator = forgetting + k0 + x * k1
+        g0 = k0 / denominator
+        g1 = k1 / denominator
+        error = rate - (self._a + self._b * x)
+        self._a += g0 * error
+        self._b += g1 * error
+        self._p00 = (self._p00 - g0 * k0) / forgetting
+        self._p01 = (self._p01 - g0 * k1) / forgetting
+        self._p11 = (self._p11 - g1 * k1) / forgetting
+        self.samples += 1
+
+    def rate(self, temperature: float) -> float | None:
+        """Return the estimated rate (°C/h) at a temperature."""
+        if self.samples < MIN_SAMPLES:
+            return None
+        return self._a + self._b * (temperature - REFERENCE_TEMPERATURE)
+
+    def hours_to(self, start: float, end: float) -> float | None:
+        """Return the hours to get from the start to the end temperature.
+
+        None is returned if there is no estimate yet or if the end temperature
+        is not reached at the estimated rates.
+        """
+        if start == end:
+            return 0.0
+        if (start_rate := self.rate(start)) is None:
+            return None
+        end_rate = self.rate(end)
+        direction = 1 if end > start else -1
+        if start_rate * direction <= 0 or end_rate * direction <= 0:
+            return None
+        if abs(self._b) < MIN_SLOPE:
+            return (end - start) / ((start_rate + end_rate) / 2)
+        # Solution of dT/dt = a + b * (T - 20) between both temperatures
+        return math.log(end_rate / start_rate) / self._b
+
+    def as_dict(self) -> dict:
+        """Return the state of the fit to store."""
+        return {
+            "theta": [self._a, self._b],
+            "covariance": [self._p00, self._p01, self._p11],
+            "samples": self.samples,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> RateEstimator:
+        """Restore a stored fit."""
+        return cls(
+            tuple(data["theta"]), tuple(data["covariance"]), int(data["samples"])
+        )
+
+
+class ThermalModel:
+    """The rates of a room with the relay on (active) and off (idle)."""
+
+    def __init__(
+        self,
+        active: RateEstimator | None = None,
+        idle: RateEstimator | None = None,
+    ) -> None:
+        """Initialize."""
+        self.active = active or RateEstimator()
+        self.idle = idle or RateEstimator()
+        # (timestamp, temperature, output) of the start of the current interval
+        self._anchor: tuple[float, float, bool] | None = None
+
+    def add_sample(self, timestamp: float, temperature: float, output: bool) -> None:
+        """Add a sample, `timestamp` is a monotonic time in seconds.
+
+        A rate is only observed between samples with the same relay state, the
+        intervals in which the relay switched are skipped.
+        """
+        anchor = self._anchor
+        if (
+            anchor is None
+            or anchor[2] != output
+            or timestamp - anchor[0] > MAX_SAMPLE_INTERVAL
+        ):
+            self._anchor = (timestamp, temperature, output)
+            return
+        elapsed = timestamp - anchor[0]
+        if elapsed < MIN_SAMPLE_INTERVAL:
+            return
+        estimator = self.active if output else self.idle
+        estimator.update(
+            (anchor[1] + temperature) / 2, (temperature - anchor[1]) * 3600 / elapsed
+        )
+        self._anchor = (timestamp, temperature, output)
+
+    def hours_to_target(
+        self, temperature: float, target: float, hvac_mode: str
+    ) -> float | None:
+        """Return the hours to reach the target with the relay on."""
+        if hvac_mode == HVAC_MODE_HEAT:
+            if temperature >= target:
+                return 0.0
+        elif hvac_mode == HVAC_MODE_COOL:
+            if temperature <= target:
+                return 0.0
+        else:
+            return None
+        return self.active.hours_to(temperature, target)
+
+    def as_dict(self) -> dict:
+        """Return the state of the model to store."""
+        return {"active": self.active.as_dict(), "idle": self.idle.as_dict()}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> ThermalModel:
+        """Restore a stored model."""
+        return cls(
+            RateEstimator.from_dict(data["active"]),
+            RateEstimator.from_dict(data["idle"]),
+        )
@@ -0,0 +1,88 @@
+"""Validation and filtering of the temperature readings."""
+
+from __future__ import annotations
+
+import statistics
+from collections import deque
+
+# The range of the DS18B20 sensor, which reports -127 when it is disconnected
+# and 85 after a power-on reset.
+MIN_TEMPERATURE = -55.0
+MAX_TEMPERATURE = 85.0
+# °C per minute, faster changes are treated as spikes
+MAX_RATE = 5.0
+# A spike is accepted as a real change once it was confirmed this many times
+MAX_REJECTED = 3
+# Seconds the reported uptime may stay the same, a bit more than two polls.
+# Gen1 devices count it in whole seconds, so two polls within the same second
+# report the same uptime.
+STALE_AFTER = 90
+# Seconds after which the last accepted reading is stale, as the device has
+# not pushed or been polled for several of the intervals of the pushed status
+MAX_AGE = 15 * 60
+
+FAULT_MISSING = "missing"
+FAULT_IMPLAUSIBLE = "implausible"
+FAULT_SPIKE = "spike"
+FAULT_STALE = "stale"
+
+
+class TemperatureFilter:
+    """Reject implausible, spiking and stale readings of a temperature sensor.
+
+    The accepted readings are optionally smoothed with a median over the last
+    `median_window` of them.
+    """
+
+    def __init__(self, median_window: int = 1) -> None:
+        """Initialize."""
+        self._samples: deque[float] = deque(maxlen=max(median_window, 1))
+        # (timestamp, temperature) of the last accepted reading
+        self._last: tuple[float, float] | None = None
+        self._rejected = 0
+        # The last reported uptime and since when it did not advance
+        self._uptime: float | None = None
+        self._uptime_since = 0.0
+
+    def filter(
+        self,
+        timestamp: float,
+        temperature: float | None,
+        uptime: float | None = None,
+    ) -> tuple[float | None, str | None]:
+        """Return the filtered temperature and the fault of a reading.
+
+        `timestamp` is a monotonic time in seconds. `uptime` is the uptime the
+        device reported with the reading, a status is stale once the uptime
+        did not advance for `STALE_AFTER` seconds.
+        """
+        stale = False
+        if uptime is not None:
+            if uptime != self._uptime:
+                self._uptime = uptime
+                self._uptime_since = timestamp
+            stale = timestamp - self._uptime_since > STALE_AFTER
+        if temperature is None:
+            return None, FAULT_MISSING
+        if not MIN_TEMPERATURE < temperature < MAX_TEMPERATURE:
+            return None, FAULT_IMPLAUSIBLE
+        if stale:
+            return None, FAULT_STALE
+        if self._last is not None:
+            last_timestamp, last_temperature = self._last
+            # Readings less than a minute apart may change as much as in a minute
+            minutes = max((timestamp - last_timestamp) / 60, 1)
+            if abs(temperature - last_temperature) > MAX_RATE * minutes:
+                self._rejected += 1
+                if self._rejected < MAX_REJECTED:
+                    return None, FAULT_SPIKE
+                # The change persists, so it is real, e.g. the sensor was moved
+                self._samples.clear()
+        self._rejected = 0
+        self._last = (timestamp, temperature)
+        self._samples.append(temperature)
+        return statistics.median(self._samples), None
+
+    def expired(self, timestamp: float) -> bool:
+        """Return True if the last accepted reading is older than `MAX_AGE`."""
+        return self._last is not None and timestamp - self._last[0] > MAX_AGE
@@ -0,0 +1,78 @@
+"""Concurrent writes to a zone of shelly thermostats."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+
+from homeassistant.exceptions import HomeAssistantError
+
+from .const import DEFAULT_ZONE_CONCURRENCY, LOGGER
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from .coordinator import ShellyDataUpdateCoordinator
+
+
+async def async_set_zone(
+    coordinators: Mapping[str, ShellyDataUpdateCoordinator],
+    *,
+    temperature: float | None = None,
+    hvac_mode: str | None = None,
+    force: bool = False,
+    max_concurrency: int = DEFAULT_ZONE_CONCURRENCY,
+) -> dict[str, str | None]:
+    """Write the hvac mode and/or target temperature to many devices.
+
+    The writes are fanned out concurrently, with at most `max_concurrency`
+    devices being written at the same time. The devices that were written (or
+    failed) are refreshed in a single pass afterwards instead of one refresh
+    per write, under the same concurrency limit. Returns the error message
+    per key, or None on success.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _async_write(coordinator: ShellyDataUpdateCoordinator) -> None:
+        async with semaphore:
+            if hvac_mode is not None:
+                await coordinator.async_set_hvac_mode(
+                    hvac_mode, force=force, refresh=False
+                )
+            if temperature is not None:
+                await coordinator.async_set_target_temperature(
+                    temperature, force=force, refresh=False
+                )
+
+    keys = list(coordinators)
+    writes_sent = {key: coordinators[key].writes_sent for key in keys}
+    outcomes = await asyncio.gather(
+        *(_async_write(coordinators[key]) for key in keys), return_exceptions=True
+    )
+
+    results: dict[str, str | None] = {}
+    stale: dict[int, ShellyDataUpdateCoordinator] = {}
+    for key, outcome in zip(keys, outcomes):
+        coordinator = coordinators[key]
+        if outcome is not None or coordinator.writes_sent != writes_sent[key]:
+            stale[id(coordinator)] = coordinator
+        if outcome is None:
+            results[key] = None
+            continue
+        if isinstance(outcome, HomeAssistantError):
+            LOGGER.warning("Setting the zone failed for %s: %s", key, outcome)
+        else:
+            LOGGER.error(
+                "Unexpected error setting the zone for %s", key, exc_info=outcome
+            )
+        results[key] = str(outcome) or type(outcome).__name__
+
+    async def _async_refresh(coordinator: ShellyDataUpdateCoordinator) -> None:
+        async with semaphore:
+            await coordinator.async_refresh()
+
+    # Devices where every write was skipped are already up to date
+    await asyncio.gather(
+        *(_async_refresh(coordinator) for coordinator in stale.values())
+    )
+    return results
@@ -1 +1,10 @@
 """Tests for integration_blueprint integration."""
+
+
+def settings_writes(aioclient_mock):
+    """Return the URLs of the settings writes made through the aiohttp mock."""
+    return [
+        url
+        for _, url, _, _ in aioclient_mock.mock_calls
+        if url.path.startswith("/settings/")
+    ]
@@ -18,6 +18,12 @@
 from unittest.mock import patch
 
 import pytest
+from homeassistant.const import CONF_HOST
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.shelly_thermostat.const import DOMAIN
+
+from .const import MOCK_SETTINGS, MOCK_STATUS
 
 pytest_plugins = "pytest_homeassistant_custom_component"
 
@@ -62,3 +68,25 @@ def error_get_data_fixture():
         side_effect=Exception,
     ):
         yield
+
+
+# This fixture registers the Gen1 HTTP endpoints of a thermostat on `localhost`
+# with the aiohttp mock, including the `/settings/ext_temperature/0` writes.
+@pytest.fixture(name="mock_device")
+def mock_device_fixture(aioclient_mock):
+    """Mock the HTTP API of a Shelly thermostat."""
+    aioclient_mock.get("http://localhost/status", json=MOCK_STATUS)
+    aioclient_mock.get("http://localhost/settings", json=MOCK_SETTINGS)
+    aioclient_mock.get("http://localhost/settings/ext_temperature/0", json={})
+    return aioclient_mock
+
+
+# This fixture sets up a config entry for the mocked device and returns it.
+@pytest.fixture(name="init_integration")
+async def init_integration_fixture(hass, mock_device):
+    """Set up the integration for the mocked device."""
+    entry = MockConfigEntry(domain=DOMAIN, data={CONF_HOST: "localhost"})
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return entry
@@ -4,3 +4,26 @@ from homeassistant.const import CONF_HOST, CONF_SCAN_INTERVAL
 
 # Mock config data to be used across multiple tests
 MOCK_CONFIG = {CONF_HOST: "localhost", CONF_SCAN_INTERVAL: "27"}
+
+# Trimmed down Gen1 /status and /settings payloads of a Shelly 1 with add-on
+MOCK_STATUS = {
+    "mac": "AABBCCDDEEFF",
+    "uptime": 3600,
+    "unixtime": 1700000000,
+    "wifi_sta": {"connected": True, "ssid": "Home", "ip": "192.168.1.20"},
+    "relays": [{"ison": True}],
+    "ext_temperature": {"0": {"hwID": "28ff0000", "tC": 20.5}},
+}
+MOCK_SETTINGS = {
+    "name": "Living room",
+    "device": {"type": "SHSW-1", "mac": "AABBCCDDEEFF"},
+    "mqtt": {"enable": True, "id": "shelly1-AABBCC"},
+    "ext_temperature": {
+        "0": {
+            "overtemp_threshold_tC": 21.3,
+            "overtemp_act": "relay_off",
+            "undertemp_threshold_tC": 20.9,
+            "undertemp_act": "relay_on",
+        }
+    },
+}
@@ -0,0 +1,30 @@
+"""Tests for the shelly_thermostat coordinator."""
+
+from homeassistant.helpers import entity_registry as er
+
+from . import settings_writes
+
+
+async def test_write_guard(hass, init_integration, mock_device):
+    """Test that unchanged writes are skipped and counted."""
+    coordinator = init_integration.runtime_data.coordinator
+    mock_device.mock_calls.clear()
+
+    await coordinator.async_set_hvac_mode("heat")
+    await coordinator.async_set_target_temperature(21.1)
+    assert not settings_writes(mock_device)
+    assert coordinator.writes_avoided == 2
+    assert coordinator.writes_sent == 0
+
+    await coordinator.async_set_hvac_mode("heat", force=True)
+    await coordinator.async_set_hvac_mode("cool")
+    writes = settings_writes(mock_device)
+    assert len(writes) == 2
+    assert writes[1].query["overtemp_act"] == "relay_on"
+    assert writes[1].query["undertemp_act"] == "relay_off"
+    assert coordinator.writes_sent == 2
+
+    entity_id = er.async_get(hass).async_get_entity_id(
+        "sensor", "shelly_thermostat", "AABBCCDDEEFF_writes_avoided"
+    )
+    assert hass.states.get(entity_id).state == "2"
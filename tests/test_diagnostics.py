@@ -0,0 +1,73 @@
+"""Tests for the shelly_thermostat diagnostics."""
+
+from homeassistant.components.diagnostics import REDACTED
+from homeassistant.const import CONF_HOST
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.shelly_thermostat.const import CONF_PAYLOAD_HISTORY, DOMAIN
+from custom_components.shelly_thermostat.diagnostics import (
+    _redact,
+    async_get_config_entry_diagnostics,
+)
+
+
+async def test_diagnostics_on_demand(hass, init_integration, mock_device):
+    """Test that the raw payloads are fetched and redacted on demand."""
+    coordinator = init_integration.runtime_data.coordinator
+    assert "status" not in coordinator.data
+    assert "settings" not in coordinator.data
+    assert init_integration.runtime_data.client.payloads is None
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, init_integration)
+    assert diagnostics["entry"]["data"][CONF_HOST] == REDACTED
+    assert diagnostics["data"]["mac"] == REDACTED
+    assert diagnostics["data"]["mqtt_id"] == REDACTED
+    assert diagnostics["data"]["temperature"] == 20.5
+    status = diagnostics["payloads"]["status"]
+    assert status["mac"] == REDACTED
+    assert status["wifi_sta"] == REDACTED
+    settings = diagnostics["payloads"]["settings"]
+    assert settings["device"]["mac"] == REDACTED
+    assert settings["mqtt"] == {"enable": True, "id": REDACTED}
+
+
+async def test_diagnostics_payload_history(hass, mock_device):
+    """Test that only the last responses are kept."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_HOST: "localhost"},
+        options={CONF_PAYLOAD_HISTORY: 3},
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    await entry.runtime_data.coordinator.async_refresh()
+    mock_device.mock_calls.clear()
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+    assert not mock_device.mock_calls
+    payloads = diagnostics["payloads"]
+    assert [payload["name"] for payload in payloads] == [
+        "settings",
+        "status",
+        "settings",
+    ]
+    assert payloads[1]["payload"]["wifi_sta"] == REDACTED
+
+
+def test_redact_gen2_mqtt():
+    """Test that the MQTT config of Gen2 devices is redacted."""
+    config = {
+        "mqtt": {
+            "enable": True,
+            "client_id": "shellyplus1-aabbccddeeff",
+            "topic_prefix": "shellyplus1-aabbccddeeff",
+        },
+        "webhooks": [{"id": 1, "name": "heat"}],
+    }
+    assert _redact({"config": config}) == {
+        "config": {
+            "mqtt": {"enable": True, "client_id": REDACTED, "topic_prefix": REDACTED},
+            "webhooks": [{"id": 1, "name": "heat"}],
+        }
+    }
@@ -0,0 +1,63 @@
+"""Check the import cost of the integration."""
+
+import subprocess
+import sys
+
+# Modules loaded by Home Assistant before it imports an integration
+PRELOADED = (
+    "aiohttp",
+    "voluptuous",
+    "homeassistant.core",
+    "homeassistant.config_entries",
+    "homeassistant.helpers.config_validation",
+    "homeassistant.helpers.update_coordinator",
+    "homeassistant.helpers.storage",
+    "homeassistant.helpers.event",
+)
+PACKAGE = "custom_components.shelly_thermostat"
+
+# Modules which are only needed by some devices and must be imported lazily
+LAZY_MODULES = (
+    "homeassistant.components.climate",
+    "homeassistant.components.mqtt",
+    f"{PACKAGE}.mqtt_api",
+    f"{PACKAGE}.rpc",
+)
+
+# About twice the cumulative import time of the integration, which is around
+# 20-35ms on a typical machine.
+IMPORT_TIME_BUDGET_US = 70_000
+
+
+def import_times() -> dict[str, int]:
+    """Return the cumulative import time in µs of the modules imported."""
+    code = "; ".join(
+        [
+            *(f"import {module}" for module in PRELOADED),
+            f"import {PACKAGE}",
+            f"import {PACKAGE}.config_flow",
+        ]
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, module = line.split("|")
+        if cumulative.strip().isdigit():
+            times[module.strip()] = int(cumulative)
+    return times
+
+
+def test_import_time():
+    """Test that loading the integration stays cheap."""
+    times = import_times()
+    for module in LAZY_MODULES:
+        assert module not in times, f"{module} is imported when loading"
+    assert PACKAGE in times
+    assert times[PACKAGE] < IMPORT_TIME_BUDGET_US
@@ -0,0 +1,135 @@
+"""Tests for the MQTT transport of shelly_thermostat."""
+
+import time
+from unittest.mock import patch
+
+import aiohttp
+import pytest
+from homeassistant.components.mqtt.const import MQTT_CONNECTION_STATE
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import CONF_HOST
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.update_coordinator import UpdateFailed
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_mqtt_message,
+)
+
+from custom_components.shelly_thermostat.const import (
+    CONF_OVERTEMP_OFFSET,
+    CONF_TRANSPORT,
+    CONF_UNDERTEMP_OFFSET,
+    DOMAIN,
+    TRANSPORT_MQTT,
+)
+from custom_components.shelly_thermostat.coordinator import (
+    PUSH_SCAN_INTERVAL,
+    SCAN_INTERVAL,
+)
+from custom_components.shelly_thermostat.validation import FAULT_STALE, MAX_AGE
+
+from .const import MOCK_SETTINGS, MOCK_STATUS
+
+MQTT_DISABLED_SETTINGS = {**MOCK_SETTINGS, "mqtt": {"enable": False, "id": None}}
+
+
+# The MQTT integration keeps its periodic housekeeping timer after the test
+@pytest.mark.parametrize("expected_lingering_timers", [True])
+async def test_mqtt_transport(hass, mqtt_mock, mock_device):
+    """Test that the status is received over MQTT and only settings are polled."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_HOST: "localhost"},
+        options={CONF_TRANSPORT: TRANSPORT_MQTT},
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = entry.runtime_data.coordinator
+    assert coordinator.data["temperature"] == 20.5
+    assert coordinator.update_interval == PUSH_SCAN_INTERVAL
+
+    async_fire_mqtt_message(hass, "shellies/shelly1-AABBCC/ext_temperature/0", "19.25")
+    async_fire_mqtt_message(hass, "shellies/shelly1-AABBCC/relay/0", "off")
+    await hass.async_block_till_done()
+    assert coordinator.data["temperature"] == 19.25
+    assert coordinator.data["output"] is False
+
+    mock_device.mock_calls.clear()
+    await coordinator.async_refresh()
+    assert [url.path for _, url, _, _ in mock_device.mock_calls] == ["/settings"]
+    # The pushed status is kept over the poll of the settings
+    assert coordinator.data["temperature"] == 19.25
+
+    # The temperature goes stale once no more readings are pushed
+    with patch(
+        "custom_components.shelly_thermostat.coordinator.time.monotonic",
+        return_value=time.monotonic() + MAX_AGE + 1,
+    ):
+        await coordinator.async_refresh()
+    assert coordinator.data["temperature"] is None
+    assert coordinator.data["temperature_fault"] == FAULT_STALE
+    async_fire_mqtt_message(hass, "shellies/shelly1-AABBCC/ext_temperature/0", "19.25")
+    await hass.async_block_till_done()
+    assert coordinator.data["temperature"] == 19.25
+    assert coordinator.data["temperature_fault"] is None
+
+    # The status is polled again while the broker is disconnected
+    async_dispatcher_send(hass, MQTT_CONNECTION_STATE, False)
+    await hass.async_block_till_done()
+    assert coordinator.update_interval == SCAN_INTERVAL
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+@pytest.mark.parametrize("expected_lingering_timers", [True])
+async def test_mqtt_disabled(hass, mqtt_mock, aioclient_mock):
+    """Test that the MQTT transport is refused while MQTT is disabled."""
+    aioclient_mock.get("http://localhost/status", json=MOCK_STATUS)
+    aioclient_mock.get("http://localhost/settings", json=MQTT_DISABLED_SETTINGS)
+    entry = MockConfigEntry(domain=DOMAIN, data={CONF_HOST: "localhost"})
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        {
+            CONF_TRANSPORT: TRANSPORT_MQTT,
+            CONF_OVERTEMP_OFFSET: 0.2,
+            CONF_UNDERTEMP_OFFSET: 0.2,
+        },
+    )
+    assert result["errors"] == {CONF_TRANSPORT: "mqtt_disabled"}
+    assert CONF_TRANSPORT not in entry.options
+
+    # An entry which already uses MQTT is not retried until it is fixed
+    hass.config_entries.async_update_entry(
+        entry, options={CONF_TRANSPORT: TRANSPORT_MQTT}
+    )
+    await hass.async_block_till_done()
+    assert entry.state is ConfigEntryState.SETUP_ERROR
+
+
+async def test_mqtt_unreachable(hass, init_integration, aioclient_mock):
+    """Test that an unreachable device is reported by the options flow."""
+    aioclient_mock.clear_requests()
+    aioclient_mock.get("http://localhost/settings", exc=aiohttp.ClientError)
+    result = await hass.config_entries.options.async_init(init_integration.entry_id)
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        {
+            CONF_TRANSPORT: TRANSPORT_MQTT,
+            CONF_OVERTEMP_OFFSET: 0.2,
+            CONF_UNDERTEMP_OFFSET: 0.2,
+        },
+    )
+    assert result["errors"] == {"base": "cannot_connect"}
+
+    # The coordinator reports the failed poll instead of crashing
+    coordinator = init_integration.runtime_data.coordinator
+    await coordinator.async_refresh()
+    assert not coordinator.last_update_success
+    assert isinstance(coordinator.last_exception, UpdateFailed)
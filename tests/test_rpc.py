@@ -0,0 +1,134 @@
+"""Tests for the Gen2 RPC API client against a local stub RPC server."""
+
+import asyncio
+
+import aiohttp
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.shelly_thermostat.const import DOMAIN
+from custom_components.shelly_thermostat.rpc import ShellyRpcApiClient
+
+
+class StubRpcDevice:
+    """A minimal Gen2 device with an add-on temperature sensor."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.status = {
+            "sys": {"mac": "A8032ABE54DC", "uptime": 100},
+            "switch:0": {"id": 0, "output": False},
+            "temperature:100": {"id": 100, "tC": 20.5},
+        }
+        self.hooks: list[dict] = []
+        self.sockets: list[web.WebSocketResponse] = []
+        self.http_calls = 0
+
+    def call(self, method: str, params: dict) -> dict:
+        """Handle an RPC call."""
+        if method == "Shelly.GetStatus":
+            return self.status
+        if method == "Shelly.GetConfig":
+            return {"sys": {"device": {"name": "Bathroom"}}}
+        if method == "Shelly.GetDeviceInfo":
+            return {"model": "SNSW-001X16EU", "gen": 2}
+        if method == "Webhook.List":
+            return {"hooks": self.hooks}
+        if method == "Webhook.Create":
+            self.hooks.append({"id": len(self.hooks) + 1, **params})
+            return {"id": len(self.hooks)}
+        if method == "Webhook.Update":
+            hook = next(hook for hook in self.hooks if hook["id"] == params["id"])
+            hook.update(params)
+            return {}
+        raise KeyError(method)
+
+    async def handle_rpc(self, request: web.Request) -> web.StreamResponse:
+        """Handle a WebSocket or HTTP RPC request."""
+        if request.method == "POST":
+            self.http_calls += 1
+            message = await request.json()
+            return web.json_response(
+                {
+                    "id": message["id"],
+                    "result": self.call(message["method"], message["params"]),
+                }
+            )
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self.sockets.append(ws)
+        async for message in ws:
+            message = message.json()
+            await ws.send_json(
+                {
+                    "id": message["id"],
+                    "src": "shellyplus1-a8032abe54dc",
+                    "dst": message["src"],
+                    "result": self.call(message["method"], message["params"]),
+                }
+            )
+        return ws
+
+    async def notify(self, params: dict) -> None:
+        """Push a status notification to the connected clients."""
+        for ws in self.sockets:
+            await ws.send_json({"method": "NotifyStatus", "params": params})
+
+
+async def test_rpc_client(hass, socket_enabled):
+    """Test reading, writing and pushed updates over the WebSocket."""
+    device = StubRpcDevice()
+    app = web.Application()
+    app.router.add_route("*", "/rpc", device.handle_rpc)
+
+    async with TestServer(app) as server, aiohttp.ClientSession() as session:
+        client = ShellyRpcApiClient(
+            hass, f"{server.host}:{server.port}", session=session
+        )
+        updates = []
+        connections = []
+
+        # Without a WebSocket the calls fall back to HTTP
+        data = await client.async_get_data()
+        assert device.http_calls == 4
+        assert data["hvac_mode"] == "off"
+        assert data["target_temperature"] is None
+        assert data["model"] == "SNSW-001X16EU"
+
+        await client.async_start(
+            MockConfigEntry(domain=DOMAIN), updates.append, connections.append
+        )
+        while not device.sockets:
+            await asyncio.sleep(0.01)
+        assert connections == [True]
+
+        await client.async_set_thresholds(21.2, 20.8)
+        await client.async_set_hvac_mode("heat")
+        data = await client.async_get_data()
+        assert device.http_calls == 4
+        assert data["hvac_mode"] == "heat"
+        assert data["target_temperature"] == 21.0
+        assert data["temperature"] == 20.5
+        assert {hook["condition"] for hook in device.hooks} == {
+            "ev.tC > 21.2",
+            "ev.tC < 20.8",
+        }
+
+        await device.notify({"ts": 1, "temperature:100": {"id": 100, "tC": 21.4}})
+        await device.notify({"ts": 2, "switch:0": {"id": 0, "output": True}})
+        while len(updates) < 3:
+            await asyncio.sleep(0.01)
+        # The response to the request made after connecting, then the pushes
+        assert updates[1:] == [{"temperature": 21.4}, {"output": True}]
+
+        # A bad frame is logged and the WebSocket keeps receiving
+        for ws in device.sockets:
+            await ws.send_str("not json")
+        await device.notify({"ts": 3, "temperature:100": {"id": 100, "tC": 21.6}})
+        while len(updates) < 4:
+            await asyncio.sleep(0.01)
+        assert updates[3] == {"temperature": 21.6}
+        assert connections == [True]
+
+        await client.async_stop()
@@ -0,0 +1,119 @@
+"""Tests for the shelly_thermostat schedules."""
+
+import threading
+from datetime import datetime, time, timedelta
+
+import pytest
+import voluptuous as vol
+from homeassistant.const import CONF_HOST, EVENT_HOMEASSISTANT_STOP, WEEKDAYS
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.shelly_thermostat.const import DOMAIN, SERVICE_SET_SCHEDULE
+from custom_components.shelly_thermostat.schedule import (
+    WeeklySchedule,
+    minute_of_week,
+)
+from custom_components.shelly_thermostat.services import SET_SCHEDULE_SCHEMA
+
+from . import settings_writes
+from .const import MOCK_SETTINGS, MOCK_STATUS
+
+
+async def test_next_transition(hass):
+    """Test finding the next transition, including the wrap around the week."""
+    schedule = WeeklySchedule(
+        [
+            (minute_of_week("mon", time(6, 30)), 21.0),
+            (minute_of_week("sun", time(22, 0)), 17.0),
+        ]
+    )
+    # Wednesday
+    now = dt_util.as_local(datetime(2024, 1, 3, 12, 0, tzinfo=dt_util.UTC))
+    at, temperature = schedule.next_transition(now)
+    assert (at.weekday(), at.hour, at.minute, temperature) == (6, 22, 0, 17.0)
+    at, temperature = schedule.next_transition(at)
+    assert (at.weekday(), at.hour, at.minute, temperature) == (0, 6, 30, 21.0)
+    assert (at - now).days == 5
+
+
+def test_schedule_temperature_limits():
+    """Test that a transition outside of the climate limits is refused."""
+    with pytest.raises(vol.Invalid):
+        SET_SCHEDULE_SCHEMA(
+            {
+                "entity_id": "climate.living_room",
+                "schedule": [{"time": "07:00", "temperature": 300}],
+            }
+        )
+
+
+async def test_shared_schedule(hass, freezer, init_integration, mock_device):
+    """Test that devices with the same schedule are switched in one batch."""
+    mock_device.get(
+        "http://otherhost/status", json={**MOCK_STATUS, "mac": "112233445566"}
+    )
+    mock_device.get("http://otherhost/settings", json=MOCK_SETTINGS)
+    mock_device.get("http://otherhost/settings/ext_temperature/0", json={})
+    other = MockConfigEntry(domain=DOMAIN, data={CONF_HOST: "otherhost"})
+    other.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(other.entry_id)
+    await hass.async_block_till_done()
+
+    registry = er.async_get(hass)
+    now = dt_util.now().replace(second=0, microsecond=0)
+    freezer.move_to(now)
+    transition = now + timedelta(minutes=5)
+    at = transition.time()
+    day = WEEKDAYS[transition.weekday()]
+    for unique_id in ("AABBCCDDEEFF", "112233445566"):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_SET_SCHEDULE,
+            {
+                "entity_id": registry.async_get_entity_id("climate", DOMAIN, unique_id),
+                "schedule": [
+                    {"days": [day], "time": at.strftime("%H:%M"), "temperature": 18}
+                ],
+            },
+            blocking=True,
+        )
+
+    manager = hass.data[DOMAIN]
+    assert manager.async_get_schedule(init_integration.entry_id) is (
+        manager.async_get_schedule(other.entry_id)
+    )
+
+    mock_device.mock_calls.clear()
+    freezer.tick(timedelta(minutes=5))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    writes = settings_writes(mock_device)
+    assert {url.host for url in writes} == {"localhost", "otherhost"}
+    assert all(url.query["undertemp_threshold_tC"] == "17.8" for url in writes)
+
+
+async def test_unload_on_stop(hass, init_integration):
+    """Test that the timers are cancelled in the event loop when stopping."""
+    manager = hass.data[DOMAIN]
+    manager.async_set_schedule(
+        [init_integration.entry_id], [(minute_of_week("mon", time(6, 30)), 21.0)]
+    )
+    assert manager._timers
+    unload = manager.async_unload
+    threads = []
+
+    def _unload():
+        threads.append(threading.get_ident())
+        unload()
+
+    manager.async_unload = _unload
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_STOP)
+    await hass.async_block_till_done()
+    assert threads == [threading.get_ident()]
+    assert not manager._timers
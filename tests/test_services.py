@@ -0,0 +1,100 @@
+"""Tests for shelly_thermostat services."""
+
+import asyncio
+
+import aiohttp
+import pytest
+import voluptuous as vol
+from homeassistant.const import CONF_HOST
+from homeassistant.helpers import entity_registry as er
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.shelly_thermostat.const import DOMAIN, SERVICE_SET_ZONE
+from custom_components.shelly_thermostat.zone import async_set_zone
+
+from . import settings_writes
+from .const import MOCK_SETTINGS, MOCK_STATUS
+
+
+async def test_set_zone(hass, init_integration, mock_device):
+    """Test setting a zone with one working and one failing thermostat."""
+    mock_device.get(
+        "http://otherhost/status", json={**MOCK_STATUS, "mac": "112233445566"}
+    )
+    mock_device.get("http://otherhost/settings", json=MOCK_SETTINGS)
+    mock_device.get(
+        "http://otherhost/settings/ext_temperature/0", exc=aiohttp.ClientError
+    )
+    other = MockConfigEntry(domain=DOMAIN, data={CONF_HOST: "otherhost"})
+    other.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(other.entry_id)
+    await hass.async_block_till_done()
+
+    registry = er.async_get(hass)
+    working = registry.async_get_entity_id("climate", DOMAIN, "AABBCCDDEEFF")
+    failing = registry.async_get_entity_id("climate", DOMAIN, "112233445566")
+
+    mock_device.mock_calls.clear()
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_SET_ZONE,
+        {
+            "entity_id": [working, failing, "climate.unknown"],
+            "temperature": 17.0,
+            "max_concurrency": 1,
+        },
+        blocking=True,
+        return_response=True,
+    )
+
+    assert response[working] == {"success": True}
+    assert response[failing]["success"] is False
+    assert response["climate.unknown"]["success"] is False
+    assert len(settings_writes(mock_device)) == 2
+    # One refresh per written device, no debounced refresh per write
+    assert sum(url.path == "/status" for _, url, _, _ in mock_device.mock_calls) == 2
+
+
+async def test_set_zone_temperature_limits(hass, init_integration, mock_device):
+    """Test that a target outside of the climate limits is not written."""
+    entity_id = er.async_get(hass).async_get_entity_id(
+        "climate", DOMAIN, "AABBCCDDEEFF"
+    )
+    mock_device.mock_calls.clear()
+    with pytest.raises(vol.Invalid):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_SET_ZONE,
+            {"entity_id": entity_id, "temperature": 300},
+            blocking=True,
+            return_response=True,
+        )
+    assert not settings_writes(mock_device)
+
+
+class CountingCoordinator:
+    """A coordinator stub recording how many refreshes run at the same time."""
+
+    running = 0
+    max_running = 0
+
+    def __init__(self):
+        self.writes_sent = 0
+
+    async def async_set_target_temperature(self, temperature, force, refresh):
+        self.writes_sent += 1
+
+    async def async_refresh(self):
+        cls = type(self)
+        cls.running += 1
+        cls.max_running = max(cls.max_running, cls.running)
+        await asyncio.sleep(0)
+        cls.running -= 1
+
+
+async def test_set_zone_refresh_concurrency():
+    """Test that the refreshes after the writes respect max_concurrency."""
+    coordinators = {key: CountingCoordinator() for key in range(10)}
+    results = await async_set_zone(coordinators, temperature=20.0, max_concurrency=3)
+    assert set(results.values()) == {None}
+    assert CountingCoordinator.max_running == 3
@@ -0,0 +1,73 @@
+"""Tests for the shelly_thermostat windowed statistics."""
+
+import pytest
+from homeassistant.helpers import entity_registry as er
+
+from custom_components.shelly_thermostat.const import DOMAIN
+from custom_components.shelly_thermostat.stats import (
+    ThermostatStatistics,
+    WindowAggregator,
+)
+
+
+def test_window_slides():
+    """Test that the minimum and maximum leave the window with their bucket."""
+    window = WindowAggregator(3600)
+    window.add_reading(0, 15.0)
+    window.add_reading(600, 25.0)
+    window.add_reading(1200, 20.0)
+    assert window.minimum(1200) == 15.0
+    assert window.maximum(1200) == 25.0
+    # One bucket later the first reading is out of the window
+    assert window.minimum(3600 + 60) == 20.0
+    assert window.maximum(3600 + 60) == 25.0
+    assert window.minimum(1200 + 3600) is None
+
+
+def test_statistics():
+    """Test the time weighted mean, the relay on-time and the persistence."""
+    statistics = ThermostatStatistics()
+    statistics.add_sample(0, 20.0, True)
+    statistics.add_sample(600, 22.0, False)
+    statistics.add_sample(1500, 21.0, False)
+    # A gap while Home Assistant was stopped is not counted
+    statistics.add_sample(7200, 21.0, False)
+
+    day = statistics.windows["24h"]
+    assert day.mean(7200) == pytest.approx((20.0 * 600 + 22.0 * 900) / 1500)
+    assert day.on_time(7200) == 600
+    assert (day.minimum(7200), day.maximum(7200)) == (20.0, 22.0)
+    # Only the last reading is in the last hour
+    assert statistics.windows["1h"].minimum(7200) == 21.0
+
+    restored = ThermostatStatistics.from_dict(statistics.as_dict())
+    restored.add_sample(7260, 23.0, True)
+    restored_day = restored.windows["24h"]
+    assert restored_day.maximum(7260) == 23.0
+    assert restored_day.mean(7260) == pytest.approx(
+        (20.0 * 600 + 22.0 * 900 + 21.0 * 60) / 1560
+    )
+    assert restored_day.on_time(7260) == 600
+
+
+async def test_statistics_sensors(hass, init_integration):
+    """Test that the 24h statistics are fed by the coordinator."""
+    coordinator = init_integration.runtime_data.coordinator
+    coordinator.async_handle_push({"temperature": 21.5})
+    await hass.async_block_till_done()
+
+    registry = er.async_get(hass)
+    maximum = registry.async_get_entity_id(
+        "sensor", DOMAIN, "AABBCCDDEEFF_temperature_maximum_24h"
+    )
+    minimum = registry.async_get_entity_id(
+        "sensor", DOMAIN, "AABBCCDDEEFF_temperature_minimum_24h"
+    )
+    assert float(hass.states.get(maximum).state) == 21.5
+    assert float(hass.states.get(minimum).state) == 20.5
+    # The 1h and 7d sensors are disabled by default
+    assert registry.async_get(
+        registry.async_get_entity_id(
+            "sensor", DOMAIN, "AABBCCDDEEFF_temperature_mean_1h"
+        )
+    ).disabled
@@ -0,0 +1,102 @@
+"""Tests for the shelly_thermostat thermal model."""
+
+from datetime import timedelta
+
+import pytest
+import voluptuous as vol
+from homeassistant.const import ATTR_ENTITY_ID, ATTR_TEMPERATURE
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
+
+from custom_components.shelly_thermostat.const import (
+    ATTR_DEADLINE,
+    DOMAIN,
+    SERVICE_REACH_TARGET_BY,
+)
+from custom_components.shelly_thermostat.thermal import (
+    RateEstimator,
+    ThermalModel,
+)
+
+from . import settings_writes
+
+
+def test_rate_estimator():
+    """Test that the fit converges to a temperature dependent rate."""
+    estimator = RateEstimator()
+    for step in range(200):
+        temperature = 16 + (step % 40) / 5
+        estimator.update(temperature, 3.0 - 0.5 * (temperature - 20))
+    assert estimator.rate(20) == pytest.approx(3.0, abs=1e-3)
+    assert estimator.rate(22) == pytest.approx(2.0, abs=1e-3)
+    # Exponential approach to the 26°C at which the rate becomes 0
+    assert estimator.hours_to(20, 24) == pytest.approx(2 * 1.0986, abs=1e-2)
+    assert estimator.hours_to(20, 27) is None
+    assert RateEstimator.from_dict(estimator.as_dict()).rate(22) == estimator.rate(22)
+
+
+def test_thermal_model_samples():
+    """Test that only intervals without a relay switch are observed."""
+    model = ThermalModel()
+    model.add_sample(0, 20.0, True)
+    model.add_sample(60, 20.1, True)
+    assert model.active.samples == 0
+    model.add_sample(300, 20.5, True)
+    assert model.active.samples == 1
+    model.add_sample(600, 20.9, False)
+    model.add_sample(900, 20.8, False)
+    assert model.active.samples == 1
+    assert model.idle.samples == 1
+    assert model.hours_to_target(20.0, 21.0, "off") is None
+    assert model.hours_to_target(21.5, 21.0, "heat") == 0
+
+
+async def test_reach_target_by(hass, freezer, init_integration, mock_device):
+    """Test that the target is set just in time to reach it by the deadline."""
+    coordinator = init_integration.runtime_data.coordinator
+    # 2°C/h with the relay on, the device reports 20.5°C in heat mode
+    coordinator.thermal = ThermalModel(active=RateEstimator((2.0, 0.0), samples=10))
+    entity_id = er.async_get(hass).async_get_entity_id(
+        "sensor", DOMAIN, "AABBCCDDEEFF_time_to_target"
+    )
+    await coordinator.async_refresh()
+    # The current target is 21.1°C
+    assert float(hass.states.get(entity_id).state) == pytest.approx(18.0)
+
+    mock_device.mock_calls.clear()
+    deadline = dt_util.utcnow() + timedelta(hours=3)
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_REACH_TARGET_BY,
+        {
+            ATTR_ENTITY_ID: "climate.living_room_shelly_thermostat",
+            ATTR_TEMPERATURE: 22.5,
+            ATTR_DEADLINE: deadline,
+        },
+        blocking=True,
+    )
+    await coordinator.async_refresh()
+    assert not settings_writes(mock_device)
+
+    # A target outside of the climate limits is refused by the service
+    with pytest.raises(vol.Invalid):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_REACH_TARGET_BY,
+            {
+                ATTR_ENTITY_ID: "climate.living_room_shelly_thermostat",
+                ATTR_TEMPERATURE: 300,
+                ATTR_DEADLINE: deadline,
+            },
+            blocking=True,
+        )
+    assert coordinator.preheat[0] == 22.5
+
+    # Heating from 20.5°C to 22.5°C takes an hour, plus the margin
+    freezer.move_to(deadline - timedelta(hours=1, minutes=5))
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    writes = settings_writes(mock_device)
+    assert len(writes) == 1
+    assert writes[0].query["overtemp_threshold_tC"] == "22.7"
+    assert coordinator.preheat is None
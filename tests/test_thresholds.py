@@ -0,0 +1,68 @@
+"""Tests for the threshold offsets of shelly_thermostat."""
+
+from homeassistant.const import CONF_HOST
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.shelly_thermostat.api import ShellyApiClient
+from custom_components.shelly_thermostat.const import (
+    CONF_OVERTEMP_OFFSET,
+    CONF_UNDERTEMP_OFFSET,
+    DOMAIN,
+)
+
+from . import settings_writes
+
+
+def test_asymmetric_offsets_round_trip():
+    """Test that a target written with asymmetric offsets is read back exactly."""
+    api = ShellyApiClient(
+        "localhost",
+        session=None,
+        overtemp_offset=0.1,
+        undertemp_offset=0.5,
+    )
+    for target in (5.0, 19.9, 21.3, 22.15, 34.7):
+        assert api.target_from_thresholds(*api.thresholds_for(target)) == target
+    assert api.thresholds_for(21.0) == (21.1, 20.5)
+
+
+async def test_set_target_temperature(hass, mock_device):
+    """Test that writes are skipped when the device already has the band."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_HOST: "localhost"},
+        options={CONF_OVERTEMP_OFFSET: 0.2, CONF_UNDERTEMP_OFFSET: 0.2},
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = entry.runtime_data.coordinator
+    assert coordinator.data["target_temperature"] == 21.1
+
+    mock_device.mock_calls.clear()
+    await coordinator.async_set_target_temperature(21.1)
+    assert not settings_writes(mock_device)
+
+    await coordinator.async_set_target_temperature(22.0)
+    writes = settings_writes(mock_device)
+    assert len(writes) == 1
+    assert writes[0].query["overtemp_threshold_tC"] == "22.2"
+    assert writes[0].query["undertemp_threshold_tC"] == "21.8"
+
+
+async def test_options_flow(hass, init_integration):
+    """Test that the offsets are validated and saved by the options flow."""
+    result = await hass.config_entries.options.async_init(init_integration.entry_id)
+    assert result["type"] == "form"
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        {CONF_OVERTEMP_OFFSET: 0, CONF_UNDERTEMP_OFFSET: 0},
+    )
+    assert result["errors"] == {"base": "invalid_hysteresis"}
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        {CONF_OVERTEMP_OFFSET: 0.1, CONF_UNDERTEMP_OFFSET: 0.5},
+    )
+    assert result["type"] == "create_entry"
+    assert init_integration.options[CONF_OVERTEMP_OFFSET] == 0.1
@@ -0,0 +1,104 @@
+"""Tests for the shelly_thermostat temperature validation."""
+
+from homeassistant.const import CONF_HOST, STATE_OFF, STATE_ON
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.shelly_thermostat.const import DOMAIN
+from custom_components.shelly_thermostat.validation import (
+    FAULT_IMPLAUSIBLE,
+    FAULT_MISSING,
+    FAULT_SPIKE,
+    FAULT_STALE,
+    MAX_AGE,
+    STALE_AFTER,
+    TemperatureFilter,
+)
+
+from .const import MOCK_SETTINGS, MOCK_STATUS
+
+
+def test_temperature_filter():
+    """Test the plausibility, rate of change and stale checks."""
+    temperature_filter = TemperatureFilter()
+    assert temperature_filter.filter(0, 20.0, uptime=10) == (20.0, None)
+    assert temperature_filter.filter(30, -127.0, uptime=40) == (
+        None,
+        FAULT_IMPLAUSIBLE,
+    )
+    assert temperature_filter.filter(60, None, uptime=70) == (None, FAULT_MISSING)
+    # Two polls within the same second report the same uptime
+    assert temperature_filter.filter(60.5, 20.1, uptime=70) == (20.1, None)
+    # The uptime did not advance for more than STALE_AFTER seconds
+    assert temperature_filter.filter(60 + STALE_AFTER + 1, 20.1, uptime=70) == (
+        None,
+        FAULT_STALE,
+    )
+    assert temperature_filter.filter(160, 20.1, uptime=170) == (20.1, None)
+
+    # A jump is rejected until it was confirmed a few times
+    assert temperature_filter.filter(220, 40.0) == (None, FAULT_SPIKE)
+    assert temperature_filter.filter(250, 20.2) == (20.2, None)
+    assert temperature_filter.filter(280, 30.0) == (None, FAULT_SPIKE)
+    assert temperature_filter.filter(290, 30.0) == (None, FAULT_SPIKE)
+    assert temperature_filter.filter(300, 30.0) == (30.0, None)
+
+
+def test_expired_reading():
+    """Test that the last accepted reading expires, e.g. if no more are pushed."""
+    temperature_filter = TemperatureFilter()
+    assert not temperature_filter.expired(0)
+    assert temperature_filter.filter(0, 20.0) == (20.0, None)
+    assert not temperature_filter.expired(MAX_AGE)
+    assert temperature_filter.expired(MAX_AGE + 1)
+    # A rejected reading does not renew it
+    temperature_filter.filter(MAX_AGE, -127.0)
+    assert temperature_filter.expired(MAX_AGE + 1)
+
+
+def test_median_filter():
+    """Test the median over the last readings."""
+    temperature_filter = TemperatureFilter(median_window=3)
+    results = [
+        temperature_filter.filter(minute * 60, temperature)[0]
+        for minute, temperature in enumerate((20.0, 23.0, 20.2, 20.4, 20.6))
+    ]
+    assert results == [20.0, 21.5, 20.2, 20.4, 20.4]
+
+
+async def test_disconnected_sensor(hass, aioclient_mock):
+    """Test that a disconnected sensor is reported instead of its reading."""
+    aioclient_mock.get(
+        "http://localhost/status",
+        json={
+            **MOCK_STATUS,
+            "ext_temperature": {"0": {"hwID": "28ff0000", "tC": -127}},
+        },
+    )
+    aioclient_mock.get("http://localhost/settings", json=MOCK_SETTINGS)
+    entry = MockConfigEntry(domain=DOMAIN, data={CONF_HOST: "localhost"})
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    problem = hass.states.get("binary_sensor.living_room_temperature_sensor_problem")
+    assert problem.state == STATE_ON
+    assert problem.attributes["fault"] == FAULT_IMPLAUSIBLE
+    assert problem.attributes["raw_temperature"] == -127
+    climate = hass.states.get("climate.living_room_shelly_thermostat")
+    assert climate.attributes["current_temperature"] is None
+
+    # The device recovers and the reading is missing from the next one
+    coordinator = entry.runtime_data.coordinator
+    coordinator.async_handle_push({"temperature": 21.0})
+    await hass.async_block_till_done()
+    assert (
+        hass.states.get("binary_sensor.living_room_temperature_sensor_problem").state
+        == STATE_OFF
+    )
+    aioclient_mock.clear_requests()
+    aioclient_mock.get(
+        "http://localhost/status", json={**MOCK_STATUS, "ext_temperature": {}}
+    )
+    aioclient_mock.get("http://localhost/settings", json=MOCK_SETTINGS)
+    await coordinator.async_refresh()
+    assert coordinator.data["temperature_fault"] == FAULT_MISSING